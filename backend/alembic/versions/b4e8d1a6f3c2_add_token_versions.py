@@ -0,0 +1,39 @@
+"""Add user token versions and token revocations
+
+Revision ID: b4e8d1a6f3c2
+Revises: 5c9c1e7f2b1a
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e8d1a6f3c2'
+down_revision = '5c9c1e7f2b1a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column('token_version', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.create_table(
+        'token_revocations',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('token_version', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_token_revocations_created_at', 'token_revocations', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_token_revocations_created_at', table_name='token_revocations')
+    op.drop_table('token_revocations')
+    op.drop_column('users', 'token_version')
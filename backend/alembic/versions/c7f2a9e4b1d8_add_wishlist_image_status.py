@@ -0,0 +1,29 @@
+"""Add wishlist image status
+
+Revision ID: c7f2a9e4b1d8
+Revises: b4e8d1a6f3c2
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7f2a9e4b1d8'
+down_revision = 'b4e8d1a6f3c2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('wishlist', sa.Column('image_status', sa.String(), nullable=True))
+    op.execute("UPDATE wishlist SET image_status = 'ready' WHERE image_url IS NOT NULL")
+    op.execute(
+        "UPDATE wishlist SET image_status = 'failed' "
+        "WHERE image_url IS NULL AND url IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('wishlist', 'image_status')
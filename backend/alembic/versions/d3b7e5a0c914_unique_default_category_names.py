@@ -0,0 +1,74 @@
+"""Unique default category names
+
+Revision ID: d3b7e5a0c914
+Revises: c7f2a9e4b1d8
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3b7e5a0c914'
+down_revision = 'c7f2a9e4b1d8'
+branch_labels = None
+depends_on = None
+
+# Each default category (user_id IS NULL) with the oldest row of its name
+RANKED_DEFAULTS = """
+    ranked AS (
+        SELECT id, first_value(id) OVER (PARTITION BY name ORDER BY created_at, id) AS keep_id
+        FROM categories
+        WHERE user_id IS NULL
+    )
+"""
+
+
+def upgrade() -> None:
+    # Workers seeding concurrently could create duplicate default categories.
+    # Merge them into the oldest row before adding the index: of the budgets a
+    # user set on the copies for the same month, keep the one on the oldest row
+    # (else the newest), then repoint the rest and delete the copies.
+    op.execute(
+        f"""
+        WITH {RANKED_DEFAULTS},
+        budgets AS (
+            SELECT category_budgets.id, row_number() OVER (
+                PARTITION BY category_budgets.user_id, ranked.keep_id, category_budgets.month
+                ORDER BY category_budgets.category_id = ranked.keep_id DESC,
+                         category_budgets.created_at DESC, category_budgets.id
+            ) AS position
+            FROM category_budgets JOIN ranked ON category_budgets.category_id = ranked.id
+        )
+        DELETE FROM category_budgets
+        WHERE id IN (SELECT id FROM budgets WHERE position > 1)
+        """
+    )
+    op.execute(
+        f"""
+        WITH {RANKED_DEFAULTS}
+        UPDATE category_budgets SET category_id = ranked.keep_id
+        FROM ranked
+        WHERE category_budgets.category_id = ranked.id AND ranked.id <> ranked.keep_id
+        """
+    )
+    op.execute(
+        f"""
+        WITH {RANKED_DEFAULTS}
+        DELETE FROM categories
+        WHERE id IN (SELECT id FROM ranked WHERE id <> keep_id)
+        """
+    )
+    op.create_index(
+        'uq_default_category_name',
+        'categories',
+        ['name'],
+        unique=True,
+        postgresql_where=sa.text('user_id IS NULL'),
+        sqlite_where=sa.text('user_id IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_default_category_name', table_name='categories')
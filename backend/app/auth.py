@@ -1,28 +1,58 @@
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 import uuid
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from app.config import settings
 
-# Password hashing context
-# bcrypt has a 72-byte limit; bcrypt_sha256 pre-hashes to avoid that while
-# still supporting existing bcrypt hashes.
-pwd_context = CryptContext(schemes=["bcrypt_sha256", "bcrypt"], deprecated="auto")
+# passlib (with bcrypt) and jose (with cryptography) are slow to import and most
+# requests only decode a token, so both are imported on first use rather than
+# at startup. app.serve imports them before forking so workers share them.
+
+
+@lru_cache(maxsize=None)
+def pwd_context():
+    """Password hashing context, created on first use"""
+    from passlib.context import CryptContext
+
+    # bcrypt has a 72-byte limit; bcrypt_sha256 pre-hashes to avoid that while
+    # still supporting existing bcrypt hashes.
+    # min/max rounds are pinned to the configured cost so that hashes made with a
+    # different cost are flagged for rehash in either direction.
+    return CryptContext(
+        schemes=["bcrypt_sha256", "bcrypt"],
+        deprecated="auto",
+        bcrypt_sha256__default_rounds=settings.BCRYPT_ROUNDS,
+        bcrypt_sha256__min_rounds=settings.BCRYPT_ROUNDS,
+        bcrypt_sha256__max_rounds=settings.BCRYPT_ROUNDS,
+    )
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return pwd_context().verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    """Verify a password and return a replacement hash if the stored one is outdated"""
+    return pwd_context().verify_and_update(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
-    return pwd_context.hash(password)
+    return pwd_context().hash(password)
+
+
+def user_token_claims(user) -> dict:
+    """Claims identifying a user and their status, embedded in issued tokens"""
+    return {"sub": str(user.id), "ver": user.token_version, "active": user.is_active}
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
+    from jose import jwt
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -36,6 +66,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 def create_refresh_token(data: dict) -> str:
     """Create a JWT refresh token"""
+    from jose import jwt
+
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     to_encode.update({"exp": expire, "type": "refresh"})
@@ -45,6 +77,8 @@ def create_refresh_token(data: dict) -> str:
 
 def decode_token(token: str) -> Optional[dict]:
     """Decode and verify a JWT token"""
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         return payload
@@ -54,6 +88,8 @@ def decode_token(token: str) -> Optional[dict]:
 
 def create_password_reset_token(email: str) -> str:
     """Create a password reset token"""
+    from jose import jwt
+
     expire = datetime.utcnow() + timedelta(hours=1)
     to_encode = {"sub": email, "exp": expire, "type": "password_reset"}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
@@ -62,6 +98,8 @@ def create_password_reset_token(email: str) -> str:
 
 def verify_password_reset_token(token: str) -> Optional[str]:
     """Verify a password reset token and return the email"""
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         if payload.get("type") != "password_reset":
@@ -0,0 +1,54 @@
+"""Small in-process caches."""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+# Returned by TTLCache.get when a key is absent, since None is a valid value
+MISSING = object()
+
+# Caches created with a name, reported by the /metrics endpoint
+named_caches: dict[str, "TTLCache"] = {}
+
+
+class TTLCache:
+    """LRU cache whose entries also expire after a per-entry time-to-live.
+
+    Stored values may be None, which lets callers cache negative results.
+    Not thread-safe; intended for use from a single event loop.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, name: str | None = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        if name is not None:
+            named_caches[name] = self
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """Return the cached value, or default (MISSING) if absent or expired"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return default
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
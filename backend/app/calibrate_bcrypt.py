@@ -0,0 +1,64 @@
+"""Benchmark bcrypt cost factors on this host and recommend BCRYPT_ROUNDS.
+
+Usage:
+    python -m app.calibrate_bcrypt --target-ms 250
+"""
+import argparse
+import statistics
+import time
+from passlib.hash import bcrypt_sha256
+
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+SAMPLE_PASSWORD = "calibration-password"
+
+
+def measure_verify_ms(rounds: int, samples: int) -> float:
+    """Return the median time in milliseconds to verify a hash of the given cost"""
+    hashed = bcrypt_sha256.using(rounds=rounds).hash(SAMPLE_PASSWORD)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        bcrypt_sha256.verify(SAMPLE_PASSWORD, hashed)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def recommend_rounds(timings: dict[int, float], target_ms: float) -> int:
+    """Pick the highest cost whose verify time stays within the target"""
+    within_target = [rounds for rounds, ms in timings.items() if ms <= target_ms]
+    if not within_target:
+        return min(timings)
+    return max(within_target)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--target-ms",
+        type=float,
+        default=250.0,
+        help="Maximum acceptable password verify latency in milliseconds",
+    )
+    parser.add_argument("--samples", type=int, default=3, help="Verifications per cost")
+    parser.add_argument("--min-rounds", type=int, default=MIN_ROUNDS)
+    parser.add_argument("--max-rounds", type=int, default=MAX_ROUNDS)
+    args = parser.parse_args()
+
+    timings: dict[int, float] = {}
+    for rounds in range(args.min_rounds, args.max_rounds + 1):
+        timings[rounds] = measure_verify_ms(rounds, args.samples)
+        print(f"rounds={rounds:<3} verify={timings[rounds]:8.1f} ms")
+        # Each extra round doubles the cost; stop once we are well past the target
+        if timings[rounds] > args.target_ms * 2:
+            break
+
+    recommended = recommend_rounds(timings, args.target_ms)
+    print()
+    print(f"Recommended for a {args.target_ms:.0f} ms target: BCRYPT_ROUNDS={recommended}")
+    if timings[recommended] > args.target_ms:
+        print("Warning: even the lowest cost tested exceeds the target latency")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,16 +5,94 @@ from typing import Optional
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = ""
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    # Connecting through pgBouncer (transaction pooling) requires asyncpg's
+    # prepared statement caches to be disabled; turn off for direct connections
+    DB_PGBOUNCER: bool = True
+    DB_ECHO: bool = False
+    # Optional read replica for read-only routes. After a user writes, their
+    # reads go to the primary for READ_YOUR_WRITES_SECONDS (should exceed the
+    # replica's typical lag), as long as the client echoes X-Last-Write.
+    DATABASE_READ_URL: Optional[str] = None
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    # Per-request query count/time in a Server-Timing header and slow query log
+    SQL_INSTRUMENTATION: bool = True
+    SLOW_QUERY_MS: float = 200.0
+
+    # Prometheus metrics at /metrics; scrapers must send METRICS_TOKEN as a
+    # bearer token (outside development, /metrics refuses requests until it is set)
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: Optional[str] = None
+
+    # Per-request profiling with "X-Profile: 1" (development, or with
+    # X-Profile-Token matching PROFILING_TOKEN); reports are also saved to PROFILE_DIR
+    PROFILING_ENABLED: bool = False
+    PROFILING_TOKEN: Optional[str] = None
+    PROFILE_DIR: Optional[str] = None
 
     # JWT
     SECRET_KEY: str = ""
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Trust user status embedded in access tokens instead of loading the user
+    STATELESS_AUTH: bool = False
+    TOKEN_REVOCATION_REFRESH_SECONDS: int = 30
+
+    # Password hashing
+    # bcrypt cost factor (log2 rounds); tune with `python -m app.calibrate_bcrypt`
+    BCRYPT_ROUNDS: int = 12
 
     # CORS
     FRONTEND_URL: str = "http://localhost:5173"
 
+    # Wishlist Open Graph image fetching
+    WISHLIST_IMAGE_WORKERS: int = 4
+    WISHLIST_IMAGE_QUEUE_SIZE: int = 1000
+    # Requeue items left pending on startup; app.serve keeps this on in one
+    # worker only. Turn it off on all but one instance when running several.
+    WISHLIST_IMAGE_REQUEUE: bool = True
+    OG_HTTP_TIMEOUT_SECONDS: float = 6.0
+    # Stop reading a page after this many bytes if </head> has not appeared
+    OG_MAX_HEAD_BYTES: int = 262144
+    OG_HTTP_MAX_CONNECTIONS: int = 20
+    OG_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    OG_PER_DOMAIN_CONCURRENCY: int = 2
+    OG_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    OG_CIRCUIT_RESET_SECONDS: float = 60.0
+    OG_CACHE_SIZE: int = 2048
+    OG_CACHE_TTL_SECONDS: float = 86400.0
+    OG_NEGATIVE_CACHE_TTL_SECONDS: float = 900.0
+
+    # Wishlist thumbnail cache
+    THUMBNAIL_DIR: str = ".thumbnails"
+    THUMBNAIL_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    THUMBNAIL_MAX_SOURCE_BYTES: int = 10 * 1024 * 1024
+    # Download a source again after this long in case its image was replaced
+    THUMBNAIL_SOURCE_TTL_SECONDS: int = 86400
+
+    # Serialize list and dashboard responses from trusted rows without
+    # re-validation, and encode other responses with orjson
+    FAST_JSON: bool = False
+
+    # Response compression (zstd/brotli need the "compression" extra)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+
+    # Server (python -m app.serve)
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    # Worker processes; defaults to the number of available CPUs
+    WEB_CONCURRENCY: Optional[int] = None
+    # How long workers may take to finish in-flight requests on shutdown
+    GRACEFUL_SHUTDOWN_SECONDS: int = 30
+    # Open DB_POOL_SIZE connections per worker at startup
+    DB_POOL_WARMUP: bool = True
+
     # Environment
     ENVIRONMENT: str = "development"
 
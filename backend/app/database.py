@@ -1,24 +1,50 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+import asyncio
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import ORMExecuteState, Session, declarative_base
 from app.config import settings
 
-# Determine connect_args based on database type
-# For PostgreSQL with asyncpg: disable prepared statements for pgBouncer compatibility
-# For SQLite: no special connect_args needed
-connect_args = {}
-if settings.DATABASE_URL.startswith("postgresql"):
-    connect_args = {
-        "statement_cache_size": 0,  # Disable prepared statements for pgBouncer
-        "prepared_statement_cache_size": 0,
+
+def engine_options(database_url: str) -> dict:
+    """Keyword arguments for create_async_engine based on settings"""
+    options = {
+        "echo": settings.DB_ECHO,
+        "future": True,
     }
 
+    # For PostgreSQL with asyncpg behind pgBouncer: disable prepared statements,
+    # which do not survive transaction pooling. Direct connections keep asyncpg's
+    # statement caches so repeated queries skip the parse/plan round trip.
+    # For SQLite: no special connect_args needed
+    if database_url.startswith("postgresql") and settings.DB_PGBOUNCER:
+        options["connect_args"] = {
+            "statement_cache_size": 0,  # Disable prepared statements for pgBouncer
+            "prepared_statement_cache_size": 0,
+        }
+
+    # In-memory SQLite uses a single static connection without a queue pool
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite" or url.database not in (None, "", ":memory:"):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        )
+
+    return options
+
+
 # Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.ENVIRONMENT == "development",
-    future=True,
-    connect_args=connect_args,
-)
+engine = create_async_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -29,13 +55,82 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+
+
+def read_only_sessionmaker(bind) -> async_sessionmaker:
+    """Session factory for reads: AUTOCOMMIT, so no BEGIN/COMMIT round trips.
+
+    Each statement sees its own snapshot. Sessions refuse to flush or run
+    INSERT/UPDATE/DELETE, since nothing would roll such writes back.
+    """
+    return async_sessionmaker(
+        bind.execution_options(isolation_level="AUTOCOMMIT"),
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autoflush=False,
+        info={"read_only": True},
+    )
+
+
+# Reads that must see the latest data (authentication, a user's own recent writes)
+PrimaryReadSessionLocal = read_only_sessionmaker(engine)
+
+# Optional read replica for read-only routes; without one, reads use the primary
+if settings.DATABASE_READ_URL:
+    read_engine = create_async_engine(
+        settings.DATABASE_READ_URL, **engine_options(settings.DATABASE_READ_URL)
+    )
+    ReadSessionLocal = read_only_sessionmaker(read_engine)
+else:
+    read_engine = engine
+    ReadSessionLocal = PrimaryReadSessionLocal
+
+
+class ReadOnlySessionError(Exception):
+    """A write was attempted through a read-only session"""
+
+
+@event.listens_for(Session, "before_flush")
+def _check_flush_allowed(session: Session, flush_context, instances) -> None:
+    if session.info.get("read_only"):
+        raise ReadOnlySessionError("Cannot flush changes in a read-only session")
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush_written(session: Session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_written(orm_execute_state: ORMExecuteState) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        if orm_execute_state.session.info.get("read_only"):
+            raise ReadOnlySessionError("Cannot write in a read-only session")
+        orm_execute_state.session.info["wrote"] = True
+
+
+async def warm_pool(async_engine: AsyncEngine) -> None:
+    """Open the pool's connections up front so early requests don't pay for connecting"""
+    size = getattr(async_engine.pool, "size", None)
+    if not callable(size):
+        return
+    connections = [async_engine.connect() for _ in range(size())]
+    try:
+        await asyncio.gather(*(connection.start() for connection in connections))
+    finally:
+        for connection in connections:
+            await connection.close()
+
+
 # Base class for models
 Base = declarative_base()
 
 
-async def get_db():
+async def get_db(request: Request):
     """Dependency for getting async database sessions"""
     async with AsyncSessionLocal() as session:
+        # Lets ReadYourWritesMiddleware see whether the request wrote
+        request.state.db_session = session
         try:
             yield session
             await session.commit()
@@ -44,3 +139,9 @@ async def get_db():
             raise
         finally:
             await session.close()
+
+
+async def get_read_only_db():
+    """Dependency for read-only routes that must use the primary; never commits"""
+    async with PrimaryReadSessionLocal() as session:
+        yield session
@@ -0,0 +1,98 @@
+"""Default categories, seeded at startup and served from an in-process snapshot."""
+import uuid
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import AsyncSessionLocal
+from app.models import Category
+from app.schemas import CategoryResponse
+from app.upsert import dialect_insert
+
+# Default categories
+DEFAULT_CATEGORIES = [
+    {"name": "Food", "icon": "????", "color": "text-orange-500"},
+    {"name": "Transport", "icon": "????", "color": "text-blue-500"},
+    {"name": "Shopping", "icon": "???????", "color": "text-pink-500"},
+    {"name": "Bills", "icon": "????", "color": "text-yellow-500"},
+    {"name": "Entertainment", "icon": "????", "color": "text-purple-500"},
+    {"name": "Health", "icon": "??????", "color": "text-red-500"},
+    {"name": "Education", "icon": "????", "color": "text-green-500"},
+    {"name": "Savings", "icon": "????", "color": "text-emerald-600"},
+    {"name": "Travel", "icon": "????", "color": "text-sky-500"},
+    {"name": "Gym", "icon": "????", "color": "text-indigo-500"},
+    {"name": "Activities", "icon": "????", "color": "text-green-500"},
+    {"name": "Car", "icon": "????", "color": "text-blue-500"},
+    {"name": "Supermarket", "icon": "??????", "color": "text-amber-500"},
+    {"name": "Other", "icon": "???", "color": "text-gray-500"},
+]
+
+_default_categories: tuple[CategoryResponse, ...] | None = None
+
+
+async def load_default_categories(db: AsyncSession) -> tuple[CategoryResponse, ...]:
+    """Create missing default categories and take a snapshot of all of them"""
+    global _default_categories
+
+    result = await db.execute(
+        select(Category)
+        .where(Category.user_id.is_(None))
+        .order_by(Category.created_at, Category.id)
+    )
+    default_categories = result.scalars().all()
+
+    # Ensure default categories exist (create missing ones)
+    existing_default_names = {category.name for category in default_categories}
+    missing_defaults = [
+        cat_data for cat_data in DEFAULT_CATEGORIES
+        if cat_data["name"] not in existing_default_names
+    ]
+
+    if missing_defaults:
+        # Every worker seeds at startup; the partial unique index on default
+        # category names makes the ones that lose the race insert nothing
+        insert = dialect_insert(db)
+        await db.execute(
+            insert(Category)
+            .values([
+                {
+                    "id": uuid.uuid4(),
+                    "name": cat_data["name"],
+                    "icon": cat_data["icon"],
+                    "color": cat_data["color"],
+                    "budget_monthly": None,
+                    "is_custom": False,
+                    "user_id": None,
+                }
+                for cat_data in missing_defaults
+            ])
+            .on_conflict_do_nothing(
+                index_elements=["name"], index_where=Category.user_id.is_(None)
+            )
+        )
+        await db.commit()
+
+        result = await db.execute(
+            select(Category)
+            .where(Category.user_id.is_(None))
+            .order_by(Category.created_at, Category.id)
+        )
+        default_categories = result.scalars().all()
+
+    _default_categories = tuple(
+        CategoryResponse.model_validate(category) for category in default_categories
+    )
+    return _default_categories
+
+
+async def seed_default_categories() -> None:
+    """Seed and load default categories during app startup"""
+    async with AsyncSessionLocal() as db:
+        await load_default_categories(db)
+
+
+async def get_default_categories() -> tuple[CategoryResponse, ...]:
+    """Return the default category snapshot, loading it if startup did not"""
+    if _default_categories is None:
+        # Seeding writes, so it always goes to the primary database
+        async with AsyncSessionLocal() as db:
+            return await load_default_categories(db)
+    return _default_categories
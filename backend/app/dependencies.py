@@ -1,56 +1,139 @@
-from fastapi import Depends, HTTPException, status
+from dataclasses import dataclass
+from typing import AsyncIterator
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import uuid
-from app.database import get_db
+from app.config import settings
+from app.database import PrimaryReadSessionLocal, ReadSessionLocal, engine, get_db, read_engine
 from app.models import User
 from app.auth import decode_token
+from app.read_your_writes import LAST_WRITE_HEADER, reads_pinned_to_primary
+from app.revocation import revocation_list
 
 security = HTTPBearer()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db),
-) -> User:
-    """Get the current authenticated user from JWT token"""
-    credentials_exception = HTTPException(
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """Identity of the caller, for routes that never read other User fields"""
+
+    id: uuid.UUID
+    token_version: int
+    is_active: bool
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    token = credentials.credentials
+
+def _inactive_user_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Inactive user",
+    )
+
+
+def _decode_access_token(token: str) -> tuple[dict, uuid.UUID]:
+    """Decode an access token and return its payload and user id"""
     payload = decode_token(token)
 
     if payload is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
     # Check token type
     if payload.get("type") != "access":
-        raise credentials_exception
+        raise _credentials_exception()
 
     user_id: str = payload.get("sub")
     if user_id is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
     try:
         user_uuid = uuid.UUID(user_id)
     except ValueError:
-        raise credentials_exception
+        raise _credentials_exception()
 
-    # Get user from database
+    return payload, user_uuid
+
+
+async def _load_user(db: AsyncSession, user_uuid: uuid.UUID, payload: dict) -> User:
+    """Load the token's user and check it is still allowed to authenticate"""
     result = await db.execute(select(User).where(User.id == user_uuid))
     user = result.scalar_one_or_none()
 
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+
+    # Tokens issued before the user's last revocation are no longer valid
+    if payload.get("ver", user.token_version) != user.token_version:
+        raise _credentials_exception()
 
     if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Inactive user",
-        )
+        raise _inactive_user_exception()
 
     return user
+
+
+async def get_current_user(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """Get the current authenticated user from JWT token"""
+    payload, user_uuid = _decode_access_token(credentials.credentials)
+    # Lets get_db pin the user's reads to the primary if the request writes
+    request.state.user_id = user_uuid
+    return await _load_user(db, user_uuid, payload)
+
+
+async def get_authenticated_user(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> AuthenticatedUser:
+    """Get the caller's identity, from token claims alone when STATELESS_AUTH is on"""
+    payload, user_uuid = _decode_access_token(credentials.credentials)
+    request.state.user_id = user_uuid
+
+    token_version = payload.get("ver")
+    is_active = payload.get("active")
+    # Tokens without status claims, or a stale revocation list, fall back to the DB
+    if (
+        settings.STATELESS_AUTH
+        and isinstance(token_version, int)
+        and isinstance(is_active, bool)
+        and revocation_list.is_current()
+    ):
+        if revocation_list.is_revoked(user_uuid, token_version):
+            raise _credentials_exception()
+        if not is_active:
+            raise _inactive_user_exception()
+        return AuthenticatedUser(id=user_uuid, token_version=token_version, is_active=True)
+
+    # A read-only primary session: no transaction to begin or commit, and the
+    # connection goes back to the pool before the route runs
+    async with PrimaryReadSessionLocal() as db:
+        user = await _load_user(db, user_uuid, payload)
+    return AuthenticatedUser(
+        id=user.id, token_version=user.token_version, is_active=user.is_active
+    )
+
+
+async def get_read_db(
+    request: Request,
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
+) -> AsyncIterator[AsyncSession]:
+    """Read-only session (never commits): the replica, unless the caller wrote recently"""
+    if read_engine is not engine and reads_pinned_to_primary(
+        current_user.id, request.headers.get(LAST_WRITE_HEADER)
+    ):
+        session_factory = PrimaryReadSessionLocal
+    else:
+        session_factory = ReadSessionLocal
+    async with session_factory() as session:
+        yield session
@@ -0,0 +1,180 @@
+"""Shared outbound HTTP client with per-domain concurrency limits and circuit breakers."""
+import asyncio
+import ipaddress
+import socket
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator
+from app.config import settings
+
+if TYPE_CHECKING:
+    import httpx
+
+USER_AGENT = "BudgetTracker/1.0"
+
+# Per-domain state is kept for at most this many domains
+MAX_TRACKED_DOMAINS = 1024
+
+# Redirects followed by stream_public_url
+MAX_REDIRECTS = 5
+
+_client: "httpx.AsyncClient | None" = None
+
+
+def get_http_client() -> "httpx.AsyncClient":
+    """Return the process-wide client, creating it on first use.
+
+    Reusing one client keeps connections (and their TLS sessions) alive between
+    requests to the same host, which also avoids repeated DNS lookups. httpx is
+    imported here rather than at startup, as it is slow to import.
+    """
+    global _client
+    if _client is None:
+        import httpx
+
+        _client = httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=httpx.Timeout(settings.OG_HTTP_TIMEOUT_SECONDS, connect=3.0),
+            limits=httpx.Limits(
+                max_connections=settings.OG_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OG_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=30.0,
+            ),
+            headers={"User-Agent": USER_AGENT},
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+class BlockedURLError(Exception):
+    """The URL is not http(s), or its host does not resolve to only public addresses"""
+
+
+async def _public_address(host: str, port: int) -> str:
+    """Resolve host, returning one of its addresses if all of them are public"""
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, port, type=socket.SOCK_STREAM
+        )
+    except (socket.gaierror, UnicodeError) as exc:
+        raise BlockedURLError(f"Cannot resolve {host}") from exc
+    addresses = [info[4][0] for info in infos]
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split("%", 1)[0])
+        if not ip.is_global or ip.is_multicast:
+            raise BlockedURLError(f"{host} resolves to a non-public address")
+    return addresses[0]
+
+
+@asynccontextmanager
+async def stream_public_url(url: str) -> AsyncIterator["httpx.Response"]:
+    """GET a user-supplied URL with the shared client, refusing non-public hosts.
+
+    Every hop of the redirect chain is resolved and checked, then connected to
+    at the checked address (keeping the Host header and TLS server name), so a
+    DNS answer that changes after the check cannot point the request at an
+    internal service. Raises BlockedURLError or httpx.HTTPError.
+    """
+    import httpx
+
+    client = get_http_client()
+    target = httpx.URL(url)
+    for _ in range(MAX_REDIRECTS + 1):
+        if target.scheme not in ("http", "https") or not target.host:
+            raise BlockedURLError("Unsupported URL")
+        host = target.raw_host.decode("ascii")
+        port = target.port or (443 if target.scheme == "https" else 80)
+        address = await _public_address(host, port)
+        request = client.build_request(
+            "GET",
+            target.copy_with(host=address),
+            # The pool keys connections by address, so don't let another host
+            # reuse a connection verified for this one
+            headers={"Host": target.netloc.decode("ascii"), "Connection": "close"},
+            extensions={"sni_hostname": host},
+        )
+        response = await client.send(request, stream=True, follow_redirects=False)
+        if not response.has_redirect_location:
+            try:
+                yield response
+            finally:
+                await response.aclose()
+            return
+        await response.aclose()
+        target = target.join(response.headers["location"])
+    raise httpx.TooManyRedirects(f"More than {MAX_REDIRECTS} redirects", request=request)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a domain's circuit breaker is rejecting requests"""
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets one trial request through per cooldown"""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            # Half-open: allow a trial request and restart the cooldown
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class _DomainState:
+    def __init__(self) -> None:
+        self.semaphore = asyncio.Semaphore(settings.OG_PER_DOMAIN_CONCURRENCY)
+        self.breaker = CircuitBreaker(
+            settings.OG_CIRCUIT_FAILURE_THRESHOLD, settings.OG_CIRCUIT_RESET_SECONDS
+        )
+
+
+_domains: OrderedDict[str, _DomainState] = OrderedDict()
+
+
+def _domain_state(domain: str) -> _DomainState:
+    state = _domains.get(domain)
+    if state is None:
+        state = _domains[domain] = _DomainState()
+        # Forget the least recently used idle domains
+        for stale in list(_domains)[: max(0, len(_domains) - MAX_TRACKED_DOMAINS)]:
+            if not _domains[stale].semaphore.locked():
+                del _domains[stale]
+    _domains.move_to_end(domain)
+    return state
+
+
+@asynccontextmanager
+async def domain_slot(domain: str) -> AsyncIterator[CircuitBreaker]:
+    """Limit concurrent requests to a domain and reject it while its circuit is open.
+
+    The caller records the outcome on the yielded breaker.
+    """
+    state = _domain_state(domain.lower())
+    if not state.breaker.allow():
+        raise CircuitOpenError(domain)
+    async with state.semaphore:
+        yield state.breaker
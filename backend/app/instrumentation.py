@@ -0,0 +1,187 @@
+"""Per-request SQL statistics and slow query logging.
+
+Engine event hooks time every statement. While a request is being handled the
+count and total time are added to that request's QueryStats (found through a
+context variable), and QueryTimingMiddleware reports them in a Server-Timing
+header. Statements slower than SLOW_QUERY_MS are logged with their normalized
+SQL and the route that ran them, whether or not they happened in a request.
+
+The hooks only read a clock and a context variable, so they are cheap enough
+to leave enabled in production.
+
+capture_queries() and assert_query_count() record the statements run inside a
+block, including those of requests sent to the app in-process from inside it,
+so a change that adds queries to an endpoint (an N+1 loop, say) can be caught
+by comparing against a fixed count.
+"""
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Iterator, Optional
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL_RE = re.compile(r"(?<![\w.$])\d+(?:\.\d+)?\b")
+_PLACEHOLDER_RE = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<![:\w]):\w+")
+_PLACEHOLDER_LIST_RE = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=512)
+def normalize_sql(statement: str) -> str:
+    """Collapse whitespace and replace literals and parameter lists with ?"""
+    statement = _STRING_LITERAL_RE.sub("?", statement)
+    statement = _PLACEHOLDER_RE.sub("?", statement)
+    statement = _NUMBER_LITERAL_RE.sub("?", statement)
+    statement = _PLACEHOLDER_LIST_RE.sub("?, ...", statement)
+    return _WHITESPACE_RE.sub(" ", statement).strip()
+
+
+def route_template(scope: Scope) -> Optional[str]:
+    """Path template of the route that handled a request, e.g. /api/expenses/{expense_id}"""
+    return getattr(scope.get("route"), "path", None)
+
+
+class QueryStats:
+    """SQL statements run while handling one request"""
+
+    __slots__ = ("scope", "count", "duration", "started", "timeline")
+
+    def __init__(self, scope: Scope) -> None:
+        self.scope = scope
+        self.count = 0
+        self.duration = 0.0
+        self.started = time.perf_counter()
+        # (perf_counter start, seconds, statement) per query; only kept while profiling
+        self.timeline: Optional[list[tuple[float, float, str]]] = None
+
+    @property
+    def route(self) -> str:
+        """Route template once routing has happened, else the raw path"""
+        path = route_template(self.scope) or self.scope.get("path", "")
+        return f"{self.scope.get('method', '')} {path}".strip()
+
+    def server_timing(self) -> str:
+        total_ms = (time.perf_counter() - self.started) * 1000
+        return (
+            f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries", '
+            f"app;dur={total_ms:.1f}"
+        )
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Stats for the request being handled, if any"""
+    return _current_stats.get()
+
+
+@contextmanager
+def collect_query_stats(scope: Scope) -> Iterator[QueryStats]:
+    """Count the statements run inside the block in new QueryStats"""
+    stats = QueryStats(scope)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+# Lists receiving every statement run in this context, innermost last
+_captures: ContextVar[tuple[list[str], ...]] = ContextVar("query_captures", default=())
+
+
+@contextmanager
+def capture_queries() -> Iterator[list[str]]:
+    """Record the statements run on the app's engines inside the block"""
+    from app.database import engine, read_engine
+
+    instrument_engine(engine)
+    instrument_engine(read_engine)
+    statements: list[str] = []
+    token = _captures.set(_captures.get() + (statements,))
+    try:
+        yield statements
+    finally:
+        _captures.reset(token)
+
+
+@contextmanager
+def assert_query_count(expected: int) -> Iterator[list[str]]:
+    """Raise AssertionError unless exactly `expected` statements run inside the block"""
+    with capture_queries() as statements:
+        yield statements
+    if len(statements) != expected:
+        listing = "\n".join(
+            f"  {number}. {normalize_sql(statement)}"
+            for number, statement in enumerate(statements, 1)
+        )
+        raise AssertionError(
+            f"Expected {expected} SQL statements, {len(statements)} ran:\n{listing}"
+        )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+        if stats.timeline is not None:
+            stats.timeline.append((context._query_started, elapsed, statement))
+    for statements in _captures.get():
+        statements.append(statement)
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query (%.1f ms) in %s: %s",
+            elapsed * 1000,
+            stats.route if stats is not None else "background",
+            normalize_sql(statement),
+        )
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Time every statement run through an engine"""
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryTimingMiddleware:
+    """Collect QueryStats per request and report them in a Server-Timing header"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with collect_query_stats(scope) as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing", stats.server_timing()
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
@@ -1,12 +1,55 @@
-from fastapi import FastAPI
+import asyncio
+import hmac
+from contextlib import asynccontextmanager, suppress
+from typing import Optional
+from fastapi import FastAPI, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from app.compression import CompressionMiddleware
 from app.config import settings
-from app.routers import auth, expenses, categories, wishlist, dashboard, incomes, budgets, savings
+from app.database import engine, read_engine, warm_pool
+from app.default_categories import seed_default_categories
+from app.http_client import close_http_client
+from app.instrumentation import QueryTimingMiddleware, instrument_engine
+from app.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, render_metrics
+from app.profiling import ProfilingMiddleware
+from app.read_your_writes import LAST_WRITE_HEADER, ReadYourWritesMiddleware
+from app.responses import default_response_class
+from app.revocation import refresh_revocations_forever
+from app.wishlist_images import start_image_workers, stop_image_workers
+from app.routers import auth, expenses, categories, wishlist, dashboard, incomes, budgets, savings, images
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm per-worker state and start/stop background tasks"""
+    if settings.DB_POOL_WARMUP:
+        await warm_pool(engine)
+        if read_engine is not engine:
+            await warm_pool(read_engine)
+    await seed_default_categories()
+    await start_image_workers()
+
+    tasks = []
+    if settings.STATELESS_AUTH:
+        tasks.append(asyncio.create_task(refresh_revocations_forever()))
+
+    yield
+
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await stop_image_workers()
+    await close_http_client()
+
 
 app = FastAPI(
     title="Budget Tracker API",
     description="Personal budget tracking API with FastAPI",
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=default_response_class(),
 )
 
 # CORS middleware
@@ -16,14 +59,40 @@ origins = [
     "http://localhost:3000",  # Alternative frontend port
 ]
 
+# X-Profile: 1 answers with a profile report; innermost so the report still
+# passes through CORS, timing and compression like the response it replaces
+if settings.PROFILING_ENABLED:
+    instrument_engine(engine)
+    instrument_engine(read_engine)
+    app.add_middleware(ProfilingMiddleware)
+
+# Tells clients to keep their reads on the primary after they write
+if settings.DATABASE_READ_URL:
+    app.add_middleware(ReadYourWritesMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", LAST_WRITE_HEADER],
 )
 
+# Per-request SQL statistics and slow query log
+if settings.SQL_INSTRUMENTATION:
+    instrument_engine(engine)
+    instrument_engine(read_engine)
+    app.add_middleware(QueryTimingMiddleware)
+
+# Request counts and latency per route for /metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# gzip/brotli/zstd negotiated per request; outermost so timings exclude it
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
 # Include routers
 app.include_router(auth.router, prefix="/api")
 app.include_router(expenses.router, prefix="/api")
@@ -33,6 +102,7 @@ app.include_router(dashboard.router, prefix="/api")
 app.include_router(incomes.router, prefix="/api")
 app.include_router(budgets.router, prefix="/api")
 app.include_router(savings.router, prefix="/api")
+app.include_router(images.router, prefix="/api")
 
 
 @app.get("/")
@@ -49,3 +119,24 @@ async def root():
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
+
+
+if settings.METRICS_ENABLED:
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics(authorization: Optional[str] = Header(default=None)):
+        """Prometheus metrics for this worker"""
+        # Without a token, metrics are only served in development
+        if settings.METRICS_TOKEN:
+            allowed = hmac.compare_digest(authorization or "", f"Bearer {settings.METRICS_TOKEN}")
+        else:
+            allowed = settings.ENVIRONMENT == "development"
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid metrics token",
+            )
+        pools = {"primary": engine.pool}
+        if read_engine is not engine:
+            pools["replica"] = read_engine.pool
+        return PlainTextResponse(render_metrics(pools), media_type=METRICS_CONTENT_TYPE)
@@ -0,0 +1,234 @@
+"""Prometheus text-format metrics kept in process memory.
+
+Counters and histograms are plain dicts updated from the event loop thread, so
+recording a sample is a couple of dict lookups and additions with no locking.
+Every worker process keeps its own numbers; label each scrape target by worker
+(or run one worker per container) when running several.
+"""
+import time
+from bisect import bisect_left
+from typing import Iterable, Optional
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.cache import named_caches
+from app.instrumentation import route_template
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+OUTBOUND_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0)
+
+# Requests that matched no route share one label to bound cardinality
+UNMATCHED_ROUTE = "<unmatched>"
+
+LabelValues = tuple[str, ...]
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} counter"
+        for values, total in list(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labels, values)} {total}"
+
+
+class _HistogramSeries:
+    __slots__ = ("counts", "total")
+
+    def __init__(self, bucket_count: int) -> None:
+        # Non-cumulative count per bucket, plus one for values above the last bound
+        self.counts = [0] * (bucket_count + 1)
+        self.total = 0.0
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = REQUEST_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._series: dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = _HistogramSeries(len(self.buckets))
+        series.counts[bisect_left(self.buckets, value)] += 1
+        series.total += value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        for values, series in list(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series.counts):
+                cumulative += count
+                labels = _format_labels(self.labels, values, f'le="{bound}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            cumulative += series.counts[-1]
+            labels = _format_labels(self.labels, values, 'le="+Inf"')
+            yield f"{self.name}_bucket{labels} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, values)} {series.total}"
+            yield f"{self.name}_count{_format_labels(self.labels, values)} {cumulative}"
+
+
+def _samples(
+    name: str, kind: str, help_text: str, samples: Iterable[tuple[str, float]]
+) -> Iterable[str]:
+    """Render (label string, value) pairs computed at scrape time"""
+    yield f"# HELP {name} {help_text}"
+    yield f"# TYPE {name} {kind}"
+    for labels, value in samples:
+        yield f"{name}{labels} {value}"
+
+
+http_requests = Counter(
+    "http_requests_total", "HTTP requests handled", ("method", "route", "status")
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request handling time", ("method", "route")
+)
+open_graph_fetch_duration = Histogram(
+    "open_graph_fetch_duration_seconds",
+    "Outbound page fetches for Open Graph images",
+    ("outcome",),
+    buckets=OUTBOUND_BUCKETS,
+)
+_in_flight = 0
+
+
+class MetricsMiddleware:
+    """Count requests and time them per route"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        global _in_flight
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        _in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _in_flight -= 1
+            route = route_template(scope) or UNMATCHED_ROUTE
+            method = scope["method"]
+            http_requests.inc(method, route, str(status_code))
+            http_request_duration.observe(time.perf_counter() - started, method, route)
+
+
+def _pool_samples(pool) -> dict[str, Optional[float]]:
+    """Queue pool gauges; pools without a queue (in-memory SQLite) report none"""
+    samples = {}
+    for name in ("size", "checkedout", "overflow", "checkedin"):
+        method = getattr(pool, name, None)
+        samples[name] = float(method()) if callable(method) else None
+    if samples["overflow"] is not None:
+        # QueuePool.overflow() goes negative while fewer than pool_size are open
+        samples["overflow"] = max(samples["overflow"], 0.0)
+    return samples
+
+
+def render_metrics(pools: dict[str, object]) -> str:
+    """The current metrics in Prometheus text exposition format"""
+    lines: list[str] = []
+    lines.extend(http_requests.render())
+    lines.extend(http_request_duration.render())
+    lines.extend(
+        _samples(
+            "http_requests_in_progress", "gauge", "HTTP requests being handled", [("", _in_flight)]
+        )
+    )
+
+    pool_stats = {engine_name: _pool_samples(pool) for engine_name, pool in pools.items()}
+    for stat, help_text in (
+        ("size", "Configured database pool size"),
+        ("checkedout", "Database connections in use"),
+        ("overflow", "Database connections beyond the pool size"),
+        ("checkedin", "Idle database connections in the pool"),
+    ):
+        lines.extend(
+            _samples(
+                f"db_pool_{stat}",
+                "gauge",
+                help_text,
+                (
+                    (_format_labels(("engine",), (engine_name,)), samples[stat])
+                    for engine_name, samples in pool_stats.items()
+                    if samples[stat] is not None
+                ),
+            )
+        )
+
+    caches = [
+        (_format_labels(("cache",), (name,)), cache)
+        for name, cache in sorted(named_caches.items())
+    ]
+    lines.extend(
+        _samples(
+            "cache_hits_total", "counter", "Cache hits",
+            ((labels, cache.hits) for labels, cache in caches),
+        )
+    )
+    lines.extend(
+        _samples(
+            "cache_misses_total", "counter", "Cache misses",
+            ((labels, cache.misses) for labels, cache in caches),
+        )
+    )
+    lines.extend(
+        _samples(
+            "cache_hit_ratio", "gauge", "Share of cache lookups that were hits",
+            (
+                (labels, cache.hits / (cache.hits + cache.misses))
+                for labels, cache in caches
+                if cache.hits + cache.misses
+            ),
+        )
+    )
+    lines.extend(
+        _samples(
+            "cache_entries", "gauge", "Cached entries",
+            ((labels, len(cache)) for labels, cache in caches),
+        )
+    )
+
+    lines.extend(open_graph_fetch_duration.render())
+    return "\n".join(lines) + "\n"
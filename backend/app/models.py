@@ -5,12 +5,14 @@ from sqlalchemy import (
     String,
     Boolean,
     DateTime,
+    Integer,
     ForeignKey,
     Numeric,
     Date,
     Text,
     Index,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -26,16 +28,19 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     full_name = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    # Relationships
-    expenses = relationship("Expense", back_populates="user", cascade="all, delete-orphan")
-    categories = relationship("Category", back_populates="user", cascade="all, delete-orphan")
-    wishlist_items = relationship("Wishlist", back_populates="user", cascade="all, delete-orphan")
-    incomes = relationship("Income", back_populates="user", cascade="all, delete-orphan")
-    category_budgets = relationship("CategoryBudget", back_populates="user", cascade="all, delete-orphan")
-    savings = relationship("Savings", back_populates="user", cascade="all, delete-orphan")
+    # Relationships are never loaded implicitly (lazy="raise"): an accidental
+    # access fails at once instead of adding a query per row. Load what a
+    # query needs with an explicit loader option such as selectinload().
+    expenses = relationship("Expense", back_populates="user", lazy="raise", cascade="all, delete-orphan")
+    categories = relationship("Category", back_populates="user", lazy="raise", cascade="all, delete-orphan")
+    wishlist_items = relationship("Wishlist", back_populates="user", lazy="raise", cascade="all, delete-orphan")
+    incomes = relationship("Income", back_populates="user", lazy="raise", cascade="all, delete-orphan")
+    category_budgets = relationship("CategoryBudget", back_populates="user", lazy="raise", cascade="all, delete-orphan")
+    savings = relationship("Savings", back_populates="user", lazy="raise", cascade="all, delete-orphan")
 
 
 class Expense(Base):
@@ -51,7 +56,7 @@ class Expense(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
-    user = relationship("User", back_populates="expenses")
+    user = relationship("User", back_populates="expenses", lazy="raise")
 
     # Indexes
     __table_args__ = (
@@ -75,11 +80,21 @@ class Category(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
-    user = relationship("User", back_populates="categories")
-    budgets = relationship("CategoryBudget", back_populates="category", cascade="all, delete-orphan")
+    user = relationship("User", back_populates="categories", lazy="raise")
+    budgets = relationship("CategoryBudget", back_populates="category", lazy="raise", cascade="all, delete-orphan")
 
-    # Constraints
-    __table_args__ = (UniqueConstraint("user_id", "name", name="uq_user_category_name"),)
+    # Constraints; the unique constraint ignores NULL user_ids, so default
+    # categories get a partial index of their own
+    __table_args__ = (
+        UniqueConstraint("user_id", "name", name="uq_user_category_name"),
+        Index(
+            "uq_default_category_name",
+            "name",
+            unique=True,
+            postgresql_where=text("user_id IS NULL"),
+            sqlite_where=text("user_id IS NULL"),
+        ),
+    )
 
 
 class Wishlist(Base):
@@ -91,12 +106,14 @@ class Wishlist(Base):
     price = Column(Numeric(10, 2), nullable=False)
     url = Column(String, nullable=True)
     image_url = Column(String, nullable=True)
+    # pending while the Open Graph image is being fetched, then ready or failed
+    image_status = Column(String, nullable=True)
     notes = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
-    user = relationship("User", back_populates="wishlist_items")
+    user = relationship("User", back_populates="wishlist_items", lazy="raise")
 
 
 class Income(Base):
@@ -113,7 +130,7 @@ class Income(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    user = relationship("User", back_populates="incomes")
+    user = relationship("User", back_populates="incomes", lazy="raise")
 
 
 class CategoryBudget(Base):
@@ -127,8 +144,8 @@ class CategoryBudget(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    user = relationship("User", back_populates="category_budgets")
-    category = relationship("Category", back_populates="budgets")
+    user = relationship("User", back_populates="category_budgets", lazy="raise")
+    category = relationship("Category", back_populates="budgets", lazy="raise")
 
     __table_args__ = (
         UniqueConstraint("user_id", "category_id", "month", name="uq_user_category_month_budget"),
@@ -146,9 +163,21 @@ class Savings(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    user = relationship("User", back_populates="savings")
+    user = relationship("User", back_populates="savings", lazy="raise")
 
     __table_args__ = (
         UniqueConstraint("user_id", "month", name="uq_user_month_savings"),
         Index("ix_savings_user_month", "user_id", "month"),
     )
+
+
+class TokenRevocation(Base):
+    __tablename__ = "token_revocations"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    # Access tokens for this user with a version <= token_version are revoked
+    token_version = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (Index("ix_token_revocations_created_at", "created_at"),)
@@ -0,0 +1,205 @@
+"""On-demand profiling of single requests, installed when PROFILING_ENABLED is set.
+
+A request sending `X-Profile: 1` is run under pyinstrument (or cProfile when
+pyinstrument isn't installed) and answered with an HTML report instead of its
+normal response. The report holds the profile and a timeline of the SQL
+statements the request ran, recorded by the app.instrumentation engine hooks.
+The original status is returned in X-Profiled-Status. Reports are also written
+to PROFILE_DIR when it is set.
+
+Outside development the request must also send X-Profile-Token matching
+PROFILING_TOKEN. Profiled requests run one at a time so their profiles don't
+mix. With PROFILING_ENABLED off the middleware is not installed and costs
+nothing.
+"""
+import asyncio
+import cProfile
+import hmac
+import html
+import io
+import os
+import pstats
+import re
+import time
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from starlette.datastructures import Headers
+from starlette.responses import HTMLResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+from app.instrumentation import collect_query_stats, current_query_stats, normalize_sql
+
+try:
+    from pyinstrument import Profiler
+except ImportError:  # optional dependency
+    Profiler = None
+
+PROFILE_HEADER = "x-profile"
+TOKEN_HEADER = "x-profile-token"
+
+_profile_lock = asyncio.Lock()
+
+_REPORT_STYLE = """
+body { font: 14px system-ui, sans-serif; margin: 1.5rem; }
+table { border-collapse: collapse; width: 100%; }
+td, th { padding: 2px 8px; text-align: left; vertical-align: top; }
+td.num { text-align: right; white-space: nowrap; }
+td.bar { width: 30%; }
+td.bar span { display: block; height: 10px; min-width: 2px; background: #e8793b; }
+code { font-size: 12px; }
+iframe { width: 100%; height: 80vh; border: 1px solid #ccc; }
+"""
+
+
+def profiling_allowed(headers: Headers) -> bool:
+    """Whether a request asked to be profiled and may be"""
+    if headers.get(PROFILE_HEADER) != "1":
+        return False
+    if settings.ENVIRONMENT == "development":
+        return True
+    return bool(settings.PROFILING_TOKEN) and hmac.compare_digest(
+        headers.get(TOKEN_HEADER, ""), settings.PROFILING_TOKEN
+    )
+
+
+class _PyinstrumentRun:
+    name = "pyinstrument"
+
+    def __init__(self) -> None:
+        # async_mode follows the request across awaits and leaves out other tasks
+        self.profiler = Profiler(interval=0.001, async_mode="enabled")
+
+    def start(self) -> None:
+        self.profiler.start()
+
+    def stop(self) -> None:
+        self.profiler.stop()
+
+    def render(self) -> str:
+        # pyinstrument's report is a complete page with its own scripts
+        return f'<iframe srcdoc="{html.escape(self.profiler.output_html())}"></iframe>'
+
+
+class _CProfileRun:
+    name = "cProfile"
+
+    def __init__(self) -> None:
+        self.profiler = cProfile.Profile()
+
+    def start(self) -> None:
+        self.profiler.enable()
+
+    def stop(self) -> None:
+        self.profiler.disable()
+
+    def render(self) -> str:
+        output = io.StringIO()
+        pstats.Stats(self.profiler, stream=output).sort_stats("cumulative").print_stats(60)
+        return (
+            "<p>cProfile records everything the event loop ran meanwhile; install "
+            "pyinstrument for a profile of this request alone.</p>"
+            f"<pre>{html.escape(output.getvalue())}</pre>"
+        )
+
+
+def _sql_timeline(
+    timeline: list[tuple[float, float, str]], started: float, total: float
+) -> str:
+    if not timeline:
+        return "<p>No SQL statements.</p>"
+    rows = []
+    for query_started, elapsed, statement in timeline:
+        offset = query_started - started
+        left = max(offset, 0.0) / total * 100
+        width = elapsed / total * 100
+        rows.append(
+            f'<tr><td class="num">{offset * 1000:.1f}</td>'
+            f'<td class="num">{elapsed * 1000:.2f}</td>'
+            f'<td class="bar"><span style="margin-left:{left:.2f}%;width:{width:.2f}%">'
+            f"</span></td><td><code>{html.escape(normalize_sql(statement))}</code></td></tr>"
+        )
+    return (
+        "<table><tr><th>start ms</th><th>ms</th><th>timeline</th><th>statement</th></tr>"
+        + "".join(rows)
+        + "</table>"
+    )
+
+
+def render_report(
+    title: str,
+    status_code: int,
+    total: float,
+    started: float,
+    timeline: list[tuple[float, float, str]],
+    run: "_PyinstrumentRun | _CProfileRun",
+) -> str:
+    db_time = sum(elapsed for _, elapsed, _ in timeline)
+    return (
+        f"<!doctype html><html><head><meta charset='utf-8'><title>Profile: "
+        f"{html.escape(title)}</title><style>{_REPORT_STYLE}</style></head><body>"
+        f"<h1>{html.escape(title)}</h1>"
+        f"<p>Status {status_code} in {total * 1000:.1f} ms; {len(timeline)} SQL statements "
+        f"took {db_time * 1000:.1f} ms. Profiled with {run.name}.</p>"
+        f"<h2>SQL</h2>{_sql_timeline(timeline, started, total)}"
+        f"<h2>Profile</h2>{run.render()}</body></html>"
+    )
+
+
+def _report_filename(scope: Scope) -> str:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%f")
+    path = re.sub(r"[^A-Za-z0-9]+", "-", scope.get("path", "")).strip("-") or "root"
+    return f"{stamp}-{scope.get('method', 'GET')}-{path[:80]}.html"
+
+
+def _write_report(directory: str, filename: str, report: str) -> None:
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, filename), "w", encoding="utf-8") as report_file:
+        report_file.write(report)
+
+
+class ProfilingMiddleware:
+    """Answer requests sending X-Profile: 1 with a profile of their handling"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not profiling_allowed(Headers(scope=scope)):
+            await self.app(scope, receive, send)
+            return
+        async with _profile_lock:
+            await self.profile(scope, receive, send)
+
+    async def profile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        status_code = 500
+
+        async def capture(message: Message) -> None:
+            # The response is replaced by the report; only its status is kept
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        stats = current_query_stats()
+        collecting = collect_query_stats(scope) if stats is None else nullcontext(stats)
+        with collecting as stats:
+            stats.timeline = []
+            run = _PyinstrumentRun() if Profiler is not None else _CProfileRun()
+            started = time.perf_counter()
+            run.start()
+            try:
+                await self.app(scope, receive, capture)
+            finally:
+                run.stop()
+                total = time.perf_counter() - started
+                timeline, stats.timeline = stats.timeline, None
+
+        title = stats.route
+        if scope.get("query_string"):
+            title += "?" + scope["query_string"].decode("latin-1")
+        report = render_report(title, status_code, total, started, timeline, run)
+        headers = {"X-Profiled-Status": str(status_code)}
+        if settings.PROFILE_DIR:
+            filename = _report_filename(scope)
+            await asyncio.to_thread(_write_report, settings.PROFILE_DIR, filename, report)
+            headers["X-Profile-Report"] = filename
+        await HTMLResponse(report, headers=headers)(scope, receive, send)
@@ -0,0 +1,75 @@
+"""Read-your-writes routing for the read replica, carried by the client.
+
+When a request writes through get_db, the response carries an X-Last-Write
+token: an expiry READ_YOUR_WRITES_SECONDS ahead, signed with SECRET_KEY for the
+user. Clients send the latest token back on every request, and get_read_db
+sends the reads of a user presenting a valid, unexpired token to the primary.
+Because the pin travels with the client, it holds whichever worker or instance
+serves the next request.
+
+Without DATABASE_READ_URL every read already uses the primary, so the
+middleware is not installed and no tokens are issued.
+"""
+import hashlib
+import hmac
+import math
+import time
+import uuid
+from typing import Optional
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+
+LAST_WRITE_HEADER = "X-Last-Write"
+
+
+def _sign(user_id: uuid.UUID, expires: int) -> str:
+    digest = hmac.new(
+        settings.SECRET_KEY.encode(), f"last-write:{user_id}:{expires}".encode(), hashlib.sha256
+    )
+    return digest.hexdigest()[:32]
+
+
+def last_write_token(user_id: uuid.UUID) -> str:
+    """Token pinning the user's reads to the primary for READ_YOUR_WRITES_SECONDS"""
+    expires = math.ceil(time.time() + settings.READ_YOUR_WRITES_SECONDS)
+    return f"{expires}.{_sign(user_id, expires)}"
+
+
+def reads_pinned_to_primary(user_id: uuid.UUID, token: Optional[str]) -> bool:
+    """Whether a token sent by the user is theirs and has not expired"""
+    if not token:
+        return False
+    expires, _, signature = token.partition(".")
+    try:
+        expires_at = int(expires)
+    except ValueError:
+        return False
+    return expires_at >= time.time() and hmac.compare_digest(
+        signature, _sign(user_id, expires_at)
+    )
+
+
+class ReadYourWritesMiddleware:
+    """Add an X-Last-Write token to responses of requests that wrote"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_token(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Both set on request.state: the user by the auth dependencies,
+                # the session by get_db. Routes commit before responding.
+                state = scope.get("state", {})
+                session = state.get("db_session")
+                user_id = state.get("user_id")
+                if user_id is not None and session is not None and session.info.get("wrote"):
+                    MutableHeaders(scope=message)[LAST_WRITE_HEADER] = last_write_token(user_id)
+            await send(message)
+
+        await self.app(scope, receive, send_with_token)
@@ -0,0 +1,156 @@
+"""Re-scrape Open Graph images for wishlist items that have none.
+
+Walks wishlist rows with a URL but no image_url in id order, one batch at a
+time, scraping each batch concurrently and writing results back with a single
+batched UPDATE. Progress is saved to a checkpoint file after every batch so an
+interrupted run resumes where it stopped.
+
+Usage:
+    python -m app.refresh_wishlist_images --batch-size 200 --concurrency 16
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from pathlib import Path
+from sqlalchemy import select, update, and_, bindparam
+from app.database import AsyncSessionLocal, engine
+from app.http_client import close_http_client
+from app.models import Wishlist
+from app.utils import fetch_open_graph_image
+from app.wishlist_images import IMAGE_STATUS_READY, IMAGE_STATUS_FAILED
+
+DEFAULT_CHECKPOINT = ".refresh_wishlist_images.json"
+
+
+def load_checkpoint(path: Path) -> dict:
+    if path.exists():
+        return json.loads(path.read_text())
+    return {"last_id": None, "processed": 0, "found": 0}
+
+
+def save_checkpoint(path: Path, checkpoint: dict) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(checkpoint))
+    tmp.replace(path)
+
+
+async def fetch_batch(last_id: uuid.UUID | None, batch_size: int) -> list[tuple[uuid.UUID, str]]:
+    """Next batch of (id, url) for items missing an image, after last_id"""
+    query = select(Wishlist.id, Wishlist.url).where(
+        and_(Wishlist.url.is_not(None), Wishlist.image_url.is_(None))
+    )
+    if last_id is not None:
+        query = query.where(Wishlist.id > last_id)
+    query = query.order_by(Wishlist.id).limit(batch_size)
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(query)
+        return [(row.id, row.url) for row in result]
+
+
+async def scrape_batch(
+    rows: list[tuple[uuid.UUID, str]], semaphore: asyncio.Semaphore
+) -> list[dict]:
+    async def scrape(item_id: uuid.UUID, url: str) -> dict:
+        async with semaphore:
+            image_url = await fetch_open_graph_image(url)
+        return {
+            "b_id": item_id,
+            "b_url": url,
+            "image_url": image_url,
+            "image_status": IMAGE_STATUS_READY if image_url else IMAGE_STATUS_FAILED,
+        }
+
+    return await asyncio.gather(*(scrape(item_id, url) for item_id, url in rows))
+
+
+async def write_batch(results: list[dict]) -> None:
+    """Store a batch of results in one executemany UPDATE"""
+    # Leave items whose URL changed or that got an image while we were scraping
+    stmt = (
+        update(Wishlist)
+        .where(
+            and_(
+                Wishlist.id == bindparam("b_id"),
+                Wishlist.url == bindparam("b_url"),
+                Wishlist.image_url.is_(None),
+            )
+        )
+        .values(image_url=bindparam("image_url"), image_status=bindparam("image_status"))
+    )
+    async with engine.begin() as conn:
+        await conn.execute(stmt, results)
+
+
+async def refresh(
+    batch_size: int, concurrency: int, checkpoint_path: Path, limit: int | None
+) -> None:
+    checkpoint = load_checkpoint(checkpoint_path)
+    last_id = uuid.UUID(checkpoint["last_id"]) if checkpoint["last_id"] else None
+    if last_id is not None:
+        print(f"Resuming after {last_id} ({checkpoint['processed']} already processed)")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+    processed = 0
+
+    while limit is None or processed < limit:
+        size = batch_size if limit is None else min(batch_size, limit - processed)
+        rows = await fetch_batch(last_id, size)
+        if not rows:
+            # Finished; the next run starts over from the first item
+            checkpoint_path.unlink(missing_ok=True)
+            break
+
+        results = await scrape_batch(rows, semaphore)
+        await write_batch(results)
+
+        last_id = rows[-1][0]
+        found = sum(1 for result in results if result["image_url"])
+        processed += len(rows)
+        checkpoint.update(
+            last_id=str(last_id),
+            processed=checkpoint["processed"] + len(rows),
+            found=checkpoint["found"] + found,
+        )
+        save_checkpoint(checkpoint_path, checkpoint)
+
+        elapsed = time.perf_counter() - started
+        print(
+            f"{processed} items this run, {found}/{len(rows)} found in batch, "
+            f"{processed / elapsed:.1f} items/sec"
+        )
+
+    elapsed = time.perf_counter() - started
+    rate = processed / elapsed if elapsed else 0.0
+    print(
+        f"Done: {processed} items in {elapsed:.1f}s ({rate:.1f} items/sec); "
+        f"{checkpoint['found']}/{checkpoint['processed']} found overall"
+    )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    checkpoint_path = Path(args.checkpoint)
+    if args.restart:
+        checkpoint_path.unlink(missing_ok=True)
+    try:
+        await refresh(args.batch_size, args.concurrency, checkpoint_path, args.limit)
+    finally:
+        await close_http_client()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent page fetches")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many items")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--restart", action="store_true", help="Ignore any saved checkpoint")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
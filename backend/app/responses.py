@@ -0,0 +1,99 @@
+"""Fast JSON responses, enabled with FAST_JSON.
+
+FastAPI normally validates a handler's return value against its response_model
+(for ORM rows, attribute by attribute), converts the result to plain Python
+with jsonable_encoder and encodes it with the stdlib json module. Rows that
+come straight from our own database don't need validating again: the helpers
+here copy their loaded column values into plain dicts and encode them with
+orjson, producing the same JSON. ORJSONResponse also replaces the stdlib
+encoder for every other response.
+
+Handlers keep their response_model for the OpenAPI schema. With FAST_JSON off
+the helpers return their input unchanged and FastAPI handles it as before.
+"""
+import decimal
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Any, Iterable
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from starlette.responses import Response
+from app.config import settings
+
+
+def _default(obj: Any) -> Any:
+    """orjson fallback for types it doesn't encode natively, matching pydantic's output"""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode JSON with orjson. UUIDs, dates and datetimes are handled natively."""
+    return orjson.dumps(
+        content, default=_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+    )
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def default_response_class() -> type[JSONResponse]:
+    """Response class for the app: orjson when FAST_JSON is on"""
+    return ORJSONResponse if settings.FAST_JSON else JSONResponse
+
+
+@lru_cache(maxsize=None)
+def _response_fields(
+    model: type[BaseModel],
+) -> tuple[tuple[str, ...], tuple[tuple[str, Any], ...]]:
+    """Field names and (name, getter) pairs for the computed fields of a model"""
+    computed = tuple(
+        (name, info.wrapped_property.fget)
+        for name, info in model.model_computed_fields.items()
+    )
+    return tuple(model.model_fields), computed
+
+
+def trusted_values(model: type[BaseModel], row: Any) -> dict[str, Any]:
+    """The response model's fields read from a trusted ORM object, without validation"""
+    fields, computed = _response_fields(model)
+    # Loaded column values live in the instance dict; reading them there skips
+    # SQLAlchemy's attribute instrumentation
+    loaded = getattr(row, "__dict__", {})
+    values = {
+        name: loaded[name] if name in loaded else getattr(row, name) for name in fields
+    }
+    if computed:
+        namespace = SimpleNamespace(**values)
+        for name, getter in computed:
+            values[name] = getter(namespace)
+    return values
+
+
+def trusted_list_response(model: type[BaseModel], rows: Iterable[Any]) -> Any:
+    """JSON response for database rows that skips response_model validation"""
+    if not settings.FAST_JSON:
+        return rows
+    return ORJSONResponse([trusted_values(model, row) for row in rows])
+
+
+def trusted_response(model: type[BaseModel], row: Any) -> Any:
+    """JSON response for a single database row that skips response_model validation"""
+    if not settings.FAST_JSON:
+        return row
+    return ORJSONResponse(trusted_values(model, row))
+
+
+def model_response(content: BaseModel) -> Any:
+    """JSON response for an already built response model, skipping re-validation"""
+    if not settings.FAST_JSON:
+        return content
+    return Response(content.model_dump_json(), media_type="application/json")
@@ -0,0 +1,105 @@
+"""In-memory list of revoked access-token versions.
+
+With STATELESS_AUTH enabled, access tokens are trusted without loading the user.
+Password resets revoke a user's tokens: they bump token_version and record the
+old version in the token_revocations table. Each worker keeps the recent rows in
+memory and refreshes them every TOKEN_REVOCATION_REFRESH_SECONDS, so a revoked
+token stays usable on other workers for at most that long. The worker that
+revoked updates its own list once the transaction commits.
+
+The "active" claim is trusted as well, so anything that deactivates a user
+must also call revoke_user_tokens.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import event, select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import User, TokenRevocation
+
+logger = logging.getLogger(__name__)
+
+
+def _retention_cutoff() -> datetime:
+    """Revocations older than an access token's lifetime no longer matter"""
+    return datetime.now(timezone.utc) - timedelta(
+        minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
+    )
+
+
+class RevocationList:
+    """Maps user id to the highest revoked token version"""
+
+    def __init__(self) -> None:
+        self._revoked: dict[uuid.UUID, int] = {}
+        self._refreshed_at: float | None = None
+
+    def is_current(self) -> bool:
+        """Whether the list was refreshed recently enough to be trusted"""
+        if self._refreshed_at is None:
+            return False
+        max_age = settings.TOKEN_REVOCATION_REFRESH_SECONDS * 3
+        return time.monotonic() - self._refreshed_at <= max_age
+
+    def is_revoked(self, user_id: uuid.UUID, token_version: int) -> bool:
+        revoked_through = self._revoked.get(user_id)
+        return revoked_through is not None and token_version <= revoked_through
+
+    def add(self, user_id: uuid.UUID, token_version: int) -> None:
+        self._revoked[user_id] = max(token_version, self._revoked.get(user_id, -1))
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """Reload revocations that can still affect unexpired access tokens"""
+        result = await db.execute(
+            select(TokenRevocation.user_id, func.max(TokenRevocation.token_version))
+            .where(TokenRevocation.created_at >= _retention_cutoff())
+            .group_by(TokenRevocation.user_id)
+        )
+        # Swap in a new dict so readers never see a partially built list
+        self._revoked = {user_id: version for user_id, version in result}
+        self._refreshed_at = time.monotonic()
+
+
+revocation_list = RevocationList()
+
+# (user id, version) revoked in a session, added to revocation_list on commit
+_PENDING_REVOCATIONS = "pending_revocations"
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed_revocations(session: Session) -> None:
+    for user_id, token_version in session.info.pop(_PENDING_REVOCATIONS, ()):
+        revocation_list.add(user_id, token_version)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_revocations(session: Session) -> None:
+    session.info.pop(_PENDING_REVOCATIONS, None)
+
+
+async def revoke_user_tokens(db: AsyncSession, user: User) -> None:
+    """Invalidate every token issued to a user so far (caller commits)"""
+    revoked_version = user.token_version
+    user.token_version = revoked_version + 1
+    db.add(TokenRevocation(user_id=user.id, token_version=revoked_version))
+    await db.execute(
+        delete(TokenRevocation).where(TokenRevocation.created_at < _retention_cutoff())
+    )
+    # This worker's list only changes if the revocation is actually stored
+    db.info.setdefault(_PENDING_REVOCATIONS, []).append((user.id, revoked_version))
+
+
+async def refresh_revocations_forever() -> None:
+    """Background task that keeps this worker's revocation list up to date"""
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                await revocation_list.refresh(db)
+        except Exception:
+            logger.exception("Failed to refresh token revocation list")
+        await asyncio.sleep(settings.TOKEN_REVOCATION_REFRESH_SECONDS)
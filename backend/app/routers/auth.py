@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+import uuid
 from app.database import get_db
 from app.models import User
 from app.schemas import (
@@ -14,13 +15,15 @@ from app.schemas import (
 )
 from app.auth import (
     get_password_hash,
-    verify_password,
+    verify_and_update_password,
+    user_token_claims,
     create_access_token,
     create_refresh_token,
     decode_token,
     create_password_reset_token,
     verify_password_reset_token,
 )
+from app.revocation import revoke_user_tokens
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -60,7 +63,13 @@ async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(User).where(User.email == login_data.email))
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(login_data.password, user.hashed_password):
+    valid, new_hash = (
+        verify_and_update_password(login_data.password, user.hashed_password)
+        if user
+        else (False, None)
+    )
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -73,9 +82,15 @@ async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_db)):
             detail="Inactive user",
         )
 
+    # Transparently rehash passwords stored with an outdated scheme or cost
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+
     # Create tokens
-    access_token = create_access_token(data={"sub": str(user.id)})
-    refresh_token = create_refresh_token(data={"sub": str(user.id)})
+    claims = user_token_claims(user)
+    access_token = create_access_token(data=claims)
+    refresh_token = create_refresh_token(data=claims)
 
     return {
         "access_token": access_token,
@@ -102,9 +117,34 @@ async def refresh_token(refresh_data: RefreshToken, db: AsyncSession = Depends(g
             detail="Invalid refresh token",
         )
 
+    try:
+        user_uuid = uuid.UUID(user_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        )
+
+    # Reload the user so new tokens carry their current status
+    result = await db.execute(select(User).where(User.id == user_uuid))
+    user = result.scalar_one_or_none()
+
+    if user is None or payload.get("ver", user.token_version) != user.token_version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        )
+
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user",
+        )
+
     # Create new tokens
-    access_token = create_access_token(data={"sub": user_id})
-    new_refresh_token = create_refresh_token(data={"sub": user_id})
+    claims = user_token_claims(user)
+    access_token = create_access_token(data=claims)
+    new_refresh_token = create_refresh_token(data=claims)
 
     return {
         "access_token": access_token,
@@ -155,8 +195,9 @@ async def confirm_password_reset(
             detail="User not found",
         )
 
-    # Update password
+    # Update password and invalidate tokens issued with the old one
     user.hashed_password = get_password_hash(reset_data.new_password)
+    await revoke_user_tokens(db, user)
     await db.commit()
 
     return {"message": "Password reset successful"}
@@ -1,11 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from datetime import date
+from sqlalchemy import select, and_, or_, case, exists, func, literal
+from sqlalchemy.orm import aliased
+from datetime import date, timedelta
+from decimal import Decimal
 from app.database import get_db
-from app.models import User, Category, CategoryBudget
-from app.schemas import CategoryBudgetUpsert, CategoryBudgetResponse
-from app.dependencies import get_current_user
+from app.models import Category, CategoryBudget, Expense
+from app.schemas import (
+    CategoryBudgetUpsert,
+    CategoryBudgetBulkUpsert,
+    CategoryBudgetResponse,
+    CategoryBudgetProgress,
+)
+from app.dependencies import AuthenticatedUser, get_authenticated_user, get_read_db
+from app.responses import trusted_list_response
+from app.utils import calculate_percentage
+from app.upsert import dialect_insert, random_uuid_sql, upsert_row, upsert_rows
 
 router = APIRouter(prefix="/budgets", tags=["budgets"])
 
@@ -14,11 +24,14 @@ def normalize_month(value: date) -> date:
     return value.replace(day=1)
 
 
+BUDGET_CONFLICT_COLUMNS = ["user_id", "category_id", "month"]
+
+
 @router.get("/", response_model=list[CategoryBudgetResponse])
 async def get_budgets(
     month: date | None = None,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get category budgets for a specific month (defaults to current month)."""
     target_month = normalize_month(month or date.today())
@@ -30,13 +43,96 @@ async def get_budgets(
             )
         )
     )
-    return result.scalars().all()
+    return trusted_list_response(CategoryBudgetResponse, result.scalars().all())
+
+
+@router.get("/progress", response_model=list[CategoryBudgetProgress])
+async def get_budget_progress(
+    month: date | None = None,
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get budget, spend and remaining amount per category for a month."""
+    target_month = normalize_month(month or date.today())
+    next_month = (target_month + timedelta(days=32)).replace(day=1)
+
+    spend = (
+        select(Expense.category.label("name"), func.sum(Expense.amount).label("spent"))
+        .where(
+            and_(
+                Expense.user_id == current_user.id,
+                Expense.date >= target_month,
+                Expense.date < next_month,
+            )
+        )
+        .group_by(Expense.category)
+        .subquery()
+    )
+
+    # Defaults are hidden when the user has a custom category with the same name
+    custom = aliased(Category)
+    overridden = exists().where(
+        and_(custom.user_id == current_user.id, custom.name == Category.name)
+    )
+
+    # Fall back to the category's budget_monthly only when no monthly row exists,
+    # so a budget explicitly cleared for the month stays cleared
+    budget_amount = case(
+        (CategoryBudget.id.is_(None), Category.budget_monthly),
+        else_=CategoryBudget.amount,
+    )
+
+    result = await db.execute(
+        select(
+            Category.id,
+            Category.name,
+            Category.icon,
+            Category.color,
+            budget_amount.label("budget"),
+            spend.c.spent,
+        )
+        .outerjoin(
+            CategoryBudget,
+            and_(
+                CategoryBudget.category_id == Category.id,
+                CategoryBudget.user_id == current_user.id,
+                CategoryBudget.month == target_month,
+            ),
+        )
+        .outerjoin(spend, spend.c.name == Category.name)
+        .where(
+            or_(
+                Category.user_id == current_user.id,
+                and_(Category.user_id.is_(None), ~overridden),
+            )
+        )
+        .order_by(Category.name)
+    )
+
+    progress = []
+    for row in result:
+        spent = row.spent if row.spent is not None else Decimal("0.00")
+        budget = row.budget
+        progress.append(
+            CategoryBudgetProgress(
+                category_id=row.id,
+                category=row.name,
+                icon=row.icon,
+                color=row.color,
+                budget=budget,
+                spent=spent,
+                remaining=budget - spent if budget is not None else None,
+                percentage=calculate_percentage(spent, budget) if budget is not None else None,
+            )
+        )
+
+    return progress
 
 
 @router.put("/", response_model=CategoryBudgetResponse)
 async def upsert_budget(
     budget_data: CategoryBudgetUpsert,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Create or update a category budget for a month."""
@@ -50,29 +146,119 @@ async def upsert_budget(
             detail="Category not found",
         )
 
+    budget = await upsert_row(
+        db,
+        CategoryBudget,
+        {
+            "user_id": current_user.id,
+            "category_id": budget_data.category_id,
+            "month": target_month,
+            "amount": budget_data.amount,
+        },
+        index_elements=BUDGET_CONFLICT_COLUMNS,
+        update_columns=["amount"],
+    )
+    await db.commit()
+
+    return budget
+
+
+@router.put("/bulk", response_model=list[CategoryBudgetResponse])
+async def bulk_upsert_budgets(
+    bulk_data: CategoryBudgetBulkUpsert,
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Create or update budgets for many categories of a month at once."""
+    target_month = normalize_month(bulk_data.month)
+
+    # One row per category; ON CONFLICT cannot touch the same row twice
+    amounts = {item.category_id: item.amount for item in bulk_data.budgets}
+
     result = await db.execute(
-        select(CategoryBudget).where(
+        select(Category.id).where(
             and_(
-                CategoryBudget.user_id == current_user.id,
-                CategoryBudget.category_id == budget_data.category_id,
-                CategoryBudget.month == target_month,
+                Category.id.in_(amounts),
+                or_(Category.user_id.is_(None), Category.user_id == current_user.id),
             )
         )
     )
-    budget = result.scalar_one_or_none()
-
-    if budget is None:
-        budget = CategoryBudget(
-            user_id=current_user.id,
-            category_id=budget_data.category_id,
-            month=target_month,
-            amount=budget_data.amount,
+    if len(result.all()) != len(amounts):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Category not found",
+        )
+
+    budgets = await upsert_rows(
+        db,
+        CategoryBudget,
+        [
+            {
+                "user_id": current_user.id,
+                "category_id": category_id,
+                "month": target_month,
+                "amount": amount,
+            }
+            for category_id, amount in amounts.items()
+        ],
+        index_elements=BUDGET_CONFLICT_COLUMNS,
+        update_columns=["amount"],
+    )
+    await db.commit()
+
+    return budgets
+
+
+@router.post("/copy", response_model=list[CategoryBudgetResponse])
+async def copy_budgets(
+    from_month: date = Query(..., alias="from"),
+    to_month: date = Query(..., alias="to"),
+    overwrite: bool = False,
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Copy a month's budgets to another month in a single statement.
+
+    Budgets already set in the target month are kept unless overwrite is true.
+    Returns the budgets that were written.
+    """
+    source_month = normalize_month(from_month)
+    target_month = normalize_month(to_month)
+    if source_month == target_month:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Source and target months must differ",
+        )
+
+    source = select(
+        random_uuid_sql(db),
+        CategoryBudget.user_id,
+        CategoryBudget.category_id,
+        literal(target_month, CategoryBudget.month.type),
+        CategoryBudget.amount,
+    ).where(
+        and_(
+            CategoryBudget.user_id == current_user.id,
+            CategoryBudget.month == source_month,
+        )
+    )
+
+    insert = dialect_insert(db)
+    stmt = insert(CategoryBudget).from_select(
+        ["id", "user_id", "category_id", "month", "amount"], source
+    )
+    if overwrite:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=BUDGET_CONFLICT_COLUMNS,
+            set_={"amount": stmt.excluded.amount, "updated_at": func.now()},
         )
-        db.add(budget)
     else:
-        budget.amount = budget_data.amount
+        stmt = stmt.on_conflict_do_nothing(index_elements=BUDGET_CONFLICT_COLUMNS)
 
+    result = await db.execute(
+        stmt.returning(CategoryBudget), execution_options={"populate_existing": True}
+    )
+    budgets = result.scalars().all()
     await db.commit()
-    await db.refresh(budget)
 
-    return budget
+    return budgets
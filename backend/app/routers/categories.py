@@ -1,84 +1,77 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_
+from sqlalchemy.orm import selectinload
+from pydantic import TypeAdapter
+import hashlib
 import uuid
 from app.database import get_db
-from app.models import User, Category
+from app.models import Category
 from app.schemas import CategoryCreate, CategoryUpdate, CategoryResponse
-from app.dependencies import get_current_user
+from app.dependencies import AuthenticatedUser, get_authenticated_user, get_read_db
+from app.default_categories import get_default_categories
+from app.utils import etag_matches
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
-# Default categories
-DEFAULT_CATEGORIES = [
-    {"name": "Food", "icon": "????", "color": "text-orange-500"},
-    {"name": "Transport", "icon": "????", "color": "text-blue-500"},
-    {"name": "Shopping", "icon": "???????", "color": "text-pink-500"},
-    {"name": "Bills", "icon": "????", "color": "text-yellow-500"},
-    {"name": "Entertainment", "icon": "????", "color": "text-purple-500"},
-    {"name": "Health", "icon": "??????", "color": "text-red-500"},
-    {"name": "Education", "icon": "????", "color": "text-green-500"},
-    {"name": "Savings", "icon": "????", "color": "text-emerald-600"},
-    {"name": "Travel", "icon": "????", "color": "text-sky-500"},
-    {"name": "Gym", "icon": "????", "color": "text-indigo-500"},
-    {"name": "Activities", "icon": "????", "color": "text-green-500"},
-    {"name": "Car", "icon": "????", "color": "text-blue-500"},
-    {"name": "Supermarket", "icon": "??????", "color": "text-amber-500"},
-    {"name": "Other", "icon": "???", "color": "text-gray-500"},
-]
+
+_category_list_adapter = TypeAdapter(list[CategoryResponse])
+
+# Defaults only change on deploy; a user's merged list changes whenever they edit
+# a category, so it is revalidated by ETag instead of cached outright.
+DEFAULT_CATEGORIES_CACHE_CONTROL = "public, max-age=86400"
+USER_CATEGORIES_CACHE_CONTROL = "private, no-cache"
+
+
+def _cached_category_response(
+    request: Request, categories: list[CategoryResponse], cache_control: str
+) -> Response:
+    """Serialize categories with an ETag, answering 304 if the client has them"""
+    body = _category_list_adapter.dump_json(categories)
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get("/", response_model=list[CategoryResponse])
 async def get_categories(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all categories (default + user custom)"""
+    default_categories = await get_default_categories()
+
     # Get custom categories for the user
     result = await db.execute(
         select(Category).where(Category.user_id == current_user.id)
     )
-    custom_categories = result.scalars().all()
-
-    # Get default categories (user_id is None)
-    result = await db.execute(select(Category).where(Category.user_id.is_(None)))
-    default_categories = result.scalars().all()
-
-    # Ensure default categories exist (create missing ones)
-    existing_default_names = {category.name for category in default_categories}
-    missing_defaults = [
-        cat_data for cat_data in DEFAULT_CATEGORIES
-        if cat_data["name"] not in existing_default_names
+    custom_categories = [
+        CategoryResponse.model_validate(category) for category in result.scalars()
     ]
 
-    if missing_defaults:
-        for cat_data in missing_defaults:
-            default_cat = Category(
-                name=cat_data["name"],
-                icon=cat_data["icon"],
-                color=cat_data["color"],
-                budget_monthly=None,
-                is_custom=False,
-                user_id=None,
-            )
-            db.add(default_cat)
-
-        await db.commit()
-
-        result = await db.execute(select(Category).where(Category.user_id.is_(None)))
-        default_categories = result.scalars().all()
-
     # Combine and return, preferring user custom categories over defaults with the same name
     custom_names = {category.name for category in custom_categories}
     merged_defaults = [category for category in default_categories if category.name not in custom_names]
-    all_categories = list(merged_defaults) + list(custom_categories)
-    return all_categories
+    all_categories = merged_defaults + custom_categories
+    return _cached_category_response(request, all_categories, USER_CATEGORIES_CACHE_CONTROL)
+
+
+@router.get("/defaults", response_model=list[CategoryResponse])
+async def get_default_category_list(request: Request):
+    """Get the built-in default categories"""
+    default_categories = await get_default_categories()
+    return _cached_category_response(
+        request, list(default_categories), DEFAULT_CATEGORIES_CACHE_CONTROL
+    )
 
 
 @router.post("/", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
 async def create_category(
     category_data: CategoryCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Create a custom category"""
@@ -120,7 +113,7 @@ async def create_category(
 async def update_category(
     category_id: uuid.UUID,
     category_data: CategoryUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Update a category (custom categories only)"""
@@ -195,12 +188,16 @@ async def update_category(
 @router.delete("/{category_id}", status_code=status.HTTP_200_OK)
 async def delete_category(
     category_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Delete a custom category"""
+    # The budgets are deleted with the category by cascade; load them explicitly
+    # (relationships are lazy="raise") rather than leaving it to the flush
     result = await db.execute(
-        select(Category).where(
+        select(Category)
+        .options(selectinload(Category.budgets))
+        .where(
             and_(
                 Category.id == category_id,
                 Category.user_id == current_user.id,
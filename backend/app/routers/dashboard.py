@@ -3,10 +3,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, or_, extract
 from decimal import Decimal
 from datetime import date, datetime, timedelta
-from app.database import get_db
-from app.models import User, Expense, Wishlist, Income, Savings
+from app.models import Expense, Wishlist, Income, Savings
 from app.schemas import DashboardOverview, CategorySummary, ExpenseResponse, MonthlyCategorySpend, MonthlyAmount
-from app.dependencies import get_current_user
+from app.dependencies import AuthenticatedUser, get_authenticated_user, get_read_db
+from app.responses import model_response
 from app.utils import calculate_percentage
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
@@ -27,8 +27,8 @@ def calculate_mom(current: Decimal, previous: Decimal) -> float | None:
 
 @router.get("/overview", response_model=DashboardOverview)
 async def get_dashboard_overview(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get dashboard summary"""
     today = date.today()
@@ -208,7 +208,7 @@ async def get_dashboard_overview(
         if row.total is not None
     ]
 
-    return DashboardOverview(
+    overview = DashboardOverview(
         total_expenses_month=total_expenses_month,
         income_total_month=income_total_month,
         net_balance_month=income_total_month - total_expenses_month,
@@ -222,3 +222,4 @@ async def get_dashboard_overview(
         wishlist_total=wishlist_total if wishlist_total is not None else Decimal("0.00"),
         wishlist_count=wishlist_count if wishlist_count is not None else 0,
     )
+    return model_response(overview)
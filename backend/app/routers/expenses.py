@@ -6,9 +6,10 @@ from datetime import date
 from decimal import Decimal
 import uuid
 from app.database import get_db
-from app.models import User, Expense
+from app.models import Expense
 from app.schemas import ExpenseCreate, ExpenseResponse, ExpenseStats
-from app.dependencies import get_current_user
+from app.dependencies import AuthenticatedUser, get_authenticated_user, get_read_db
+from app.responses import trusted_list_response
 
 router = APIRouter(prefix="/expenses", tags=["expenses"])
 
@@ -20,8 +21,8 @@ async def get_expenses(
     category: Optional[str] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all user expenses with optional filters"""
     query = select(Expense).where(Expense.user_id == current_user.id)
@@ -40,13 +41,13 @@ async def get_expenses(
     result = await db.execute(query)
     expenses = result.scalars().all()
 
-    return expenses
+    return trusted_list_response(ExpenseResponse, expenses)
 
 
 @router.post("/", response_model=ExpenseResponse, status_code=status.HTTP_201_CREATED)
 async def create_expense(
     expense_data: ExpenseCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new expense"""
@@ -69,8 +70,8 @@ async def create_expense(
 async def get_expense_stats(
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get expense statistics"""
     query = select(Expense).where(Expense.user_id == current_user.id)
@@ -105,8 +106,8 @@ async def get_expense_stats(
 @router.get("/{expense_id}", response_model=ExpenseResponse)
 async def get_expense(
     expense_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a single expense"""
     result = await db.execute(
@@ -129,7 +130,7 @@ async def get_expense(
 async def update_expense(
     expense_id: uuid.UUID,
     expense_data: ExpenseCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Update an expense"""
@@ -165,7 +166,7 @@ async def update_expense(
 @router.delete("/{expense_id}", status_code=status.HTTP_200_OK)
 async def delete_expense(
     expense_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Delete an expense"""
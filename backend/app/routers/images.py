@@ -0,0 +1,52 @@
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
+from app.thumbnails import (
+    THUMBNAIL_MEDIA_TYPE,
+    THUMBNAIL_SIZES,
+    DEFAULT_THUMBNAIL_SIZE,
+    ThumbnailError,
+    get_thumbnail,
+    verify_source_signature,
+)
+from app.utils import etag_matches
+
+router = APIRouter(prefix="/images", tags=["images"])
+
+# The URL names the source, not the content, and the image behind a source URL
+# can change; keep caches short and let them revalidate with the ETag
+THUMBNAIL_CACHE_CONTROL = "public, max-age=3600"
+
+
+@router.get("/thumbnail")
+async def get_image_thumbnail(
+    request: Request,
+    src: str,
+    sig: str,
+    size: str = DEFAULT_THUMBNAIL_SIZE,
+):
+    """Serve a locally cached thumbnail of a signed third-party image URL"""
+    if size not in THUMBNAIL_SIZES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown thumbnail size",
+        )
+
+    if not verify_source_signature(src, sig):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid image signature",
+        )
+
+    try:
+        content_hash, path = await get_thumbnail(src, size)
+    except ThumbnailError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Image not available",
+        )
+
+    headers = {"ETag": f'"{content_hash}-{size}"', "Cache-Control": THUMBNAIL_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return FileResponse(path, media_type=THUMBNAIL_MEDIA_TYPE, headers=headers)
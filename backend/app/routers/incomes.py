@@ -6,9 +6,10 @@ from datetime import date
 from decimal import Decimal
 import uuid
 from app.database import get_db
-from app.models import User, Income
+from app.models import Income
 from app.schemas import IncomeCreate, IncomeUpdate, IncomeResponse, IncomeTotal
-from app.dependencies import get_current_user
+from app.dependencies import AuthenticatedUser, get_authenticated_user, get_read_db
+from app.responses import trusted_list_response
 
 router = APIRouter(prefix="/incomes", tags=["incomes"])
 
@@ -20,8 +21,8 @@ async def get_incomes(
     is_recurring: Optional[bool] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all user income records with optional filters"""
     query = select(Income).where(Income.user_id == current_user.id)
@@ -35,13 +36,13 @@ async def get_incomes(
 
     query = query.order_by(Income.date.desc()).offset(skip).limit(limit)
     result = await db.execute(query)
-    return result.scalars().all()
+    return trusted_list_response(IncomeResponse, result.scalars().all())
 
 
 @router.post("/", response_model=IncomeResponse, status_code=status.HTTP_201_CREATED)
 async def create_income(
     income_data: IncomeCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new income record"""
@@ -64,8 +65,8 @@ async def create_income(
 
 @router.get("/total", response_model=IncomeTotal)
 async def get_income_total(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get total income for the current month (including recurring)"""
     today = date.today()
@@ -93,8 +94,8 @@ async def get_income_total(
 @router.get("/{income_id}", response_model=IncomeResponse)
 async def get_income(
     income_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a single income record"""
     result = await db.execute(
@@ -117,7 +118,7 @@ async def get_income(
 async def update_income(
     income_id: uuid.UUID,
     income_data: IncomeUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Update an income record"""
@@ -156,7 +157,7 @@ async def update_income(
 @router.delete("/{income_id}", status_code=status.HTTP_200_OK)
 async def delete_income(
     income_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Delete an income record"""
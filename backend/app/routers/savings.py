@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 from datetime import date
 from app.database import get_db
-from app.models import User, Savings
+from app.models import Savings
 from app.schemas import SavingsUpsert, SavingsResponse
-from app.dependencies import get_current_user
+from app.dependencies import AuthenticatedUser, get_authenticated_user, get_read_db
+from app.responses import trusted_list_response
+from app.upsert import upsert_row
 
 router = APIRouter(prefix="/savings", tags=["savings"])
 
@@ -17,8 +19,8 @@ def normalize_month(value: date) -> date:
 @router.get("/", response_model=SavingsResponse | None)
 async def get_savings(
     month: date | None = None,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get savings entry for a specific month (defaults to current month)."""
     target_month = normalize_month(month or date.today())
@@ -33,35 +35,55 @@ async def get_savings(
     return result.scalar_one_or_none()
 
 
-@router.put("/", response_model=SavingsResponse)
-async def upsert_savings(
-    savings_data: SavingsUpsert,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+@router.get("/range", response_model=list[SavingsResponse])
+async def get_savings_range(
+    from_month: date = Query(..., alias="from"),
+    to_month: date = Query(..., alias="to"),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Create or update savings for a month."""
-    target_month = normalize_month(savings_data.month)
+    """Get savings entries for every month in an inclusive range."""
+    start_month = normalize_month(from_month)
+    end_month = normalize_month(to_month)
+    if start_month > end_month:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="from must not be after to",
+        )
+
     result = await db.execute(
-        select(Savings).where(
+        select(Savings)
+        .where(
             and_(
                 Savings.user_id == current_user.id,
-                Savings.month == target_month,
+                Savings.month >= start_month,
+                Savings.month <= end_month,
             )
         )
+        .order_by(Savings.month)
     )
-    savings = result.scalar_one_or_none()
+    return trusted_list_response(SavingsResponse, result.scalars().all())
 
-    if savings is None:
-        savings = Savings(
-            user_id=current_user.id,
-            month=target_month,
-            amount=savings_data.amount,
-        )
-        db.add(savings)
-    else:
-        savings.amount = savings_data.amount
 
+@router.put("/", response_model=SavingsResponse)
+async def upsert_savings(
+    savings_data: SavingsUpsert,
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Create or update savings for a month."""
+    target_month = normalize_month(savings_data.month)
+    savings = await upsert_row(
+        db,
+        Savings,
+        {
+            "user_id": current_user.id,
+            "month": target_month,
+            "amount": savings_data.amount,
+        },
+        index_elements=["user_id", "month"],
+        update_columns=["amount"],
+    )
     await db.commit()
-    await db.refresh(savings)
 
     return savings
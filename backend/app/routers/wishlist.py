@@ -1,28 +1,37 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, func, delete, case, literal
 from decimal import Decimal
 import uuid
 from datetime import date
 from app.database import get_db
-from app.models import User, Wishlist, Expense
+from app.models import Wishlist, Expense
 from app.schemas import (
     WishlistCreate,
     WishlistUpdate,
     WishlistResponse,
     WishlistTotal,
     WishlistPurchase,
+    WishlistBatchPurchase,
+    WishlistBatchPurchaseResult,
+)
+from app.dependencies import AuthenticatedUser, get_authenticated_user, get_read_db
+from app.responses import trusted_list_response
+from app.utils import get_current_date
+from app.upsert import dialect_insert, random_uuid_sql
+from app.wishlist_images import (
+    IMAGE_STATUS_PENDING,
+    IMAGE_STATUS_READY,
+    enqueue_image_fetch,
 )
-from app.dependencies import get_current_user
-from app.utils import get_current_date, fetch_open_graph_image
 
 router = APIRouter(prefix="/wishlist", tags=["wishlist"])
 
 
 @router.get("/", response_model=list[WishlistResponse])
 async def get_wishlist_items(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all wishlist items"""
     result = await db.execute(
@@ -32,26 +41,30 @@ async def get_wishlist_items(
     )
     wishlist_items = result.scalars().all()
 
-    return wishlist_items
+    return trusted_list_response(WishlistResponse, wishlist_items)
 
 
 @router.post("/", response_model=WishlistResponse, status_code=status.HTTP_201_CREATED)
 async def create_wishlist_item(
     item_data: WishlistCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Create a new wishlist item"""
-    image_url = item_data.image_url
-    if image_url is None and item_data.url:
-        image_url = await fetch_open_graph_image(item_data.url)
+    """Create a new wishlist item (the page image is fetched in the background)"""
+    fetch_image = item_data.image_url is None and bool(item_data.url)
+    image_status = None
+    if item_data.image_url is not None:
+        image_status = IMAGE_STATUS_READY
+    elif fetch_image:
+        image_status = IMAGE_STATUS_PENDING
 
     new_item = Wishlist(
         user_id=current_user.id,
         item_name=item_data.item_name,
         price=item_data.price,
         url=item_data.url,
-        image_url=image_url,
+        image_url=item_data.image_url,
+        image_status=image_status,
         notes=item_data.notes,
     )
 
@@ -59,13 +72,16 @@ async def create_wishlist_item(
     await db.commit()
     await db.refresh(new_item)
 
+    if fetch_image:
+        enqueue_image_fetch(new_item.id, new_item.url)
+
     return new_item
 
 
 @router.get("/total", response_model=WishlistTotal)
 async def get_wishlist_total(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get total wishlist value"""
     result = await db.execute(
@@ -81,11 +97,72 @@ async def get_wishlist_total(
     }
 
 
+@router.post("/purchase", response_model=WishlistBatchPurchaseResult)
+async def purchase_items(
+    purchase_data: WishlistBatchPurchase,
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Mark several wishlist items as purchased in one transaction"""
+    item_ids = set(purchase_data.item_ids)
+    purchase_date = purchase_data.purchase_date or get_current_date()
+    category = purchase_data.category or "Shopping"
+    owned_items = and_(Wishlist.id.in_(item_ids), Wishlist.user_id == current_user.id)
+
+    # Build every expense from its wishlist row in a single INSERT ... SELECT
+    description = (
+        literal("Purchased: ")
+        + Wishlist.item_name
+        + case(
+            (
+                and_(Wishlist.notes.is_not(None), Wishlist.notes != ""),
+                literal(" - ") + Wishlist.notes,
+            ),
+            else_="",
+        )
+    )
+    insert = dialect_insert(db)
+    result = await db.execute(
+        insert(Expense)
+        .from_select(
+            ["id", "user_id", "amount", "category", "date", "description"],
+            select(
+                random_uuid_sql(db),
+                Wishlist.user_id,
+                Wishlist.price,
+                literal(category, Expense.category.type),
+                literal(purchase_date, Expense.date.type),
+                description,
+            ).where(owned_items),
+        )
+        .returning(Expense.id)
+    )
+    expense_ids = result.scalars().all()
+
+    result = await db.execute(delete(Wishlist).where(owned_items).returning(Wishlist.id))
+    deleted_ids = result.scalars().all()
+
+    # Rows missing or owned by someone else abort the whole purchase (get_db rolls back)
+    if len(deleted_ids) != len(item_ids):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Wishlist item not found",
+        )
+
+    await db.commit()
+
+    return {
+        "expense_ids": expense_ids,
+        "purchased_count": len(deleted_ids),
+        "message": "Items marked as purchased and added to expenses",
+    }
+
+
 @router.get("/{item_id}", response_model=WishlistResponse)
 async def get_wishlist_item(
     item_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a single wishlist item"""
     result = await db.execute(
@@ -108,10 +185,10 @@ async def get_wishlist_item(
 async def update_wishlist_item(
     item_id: uuid.UUID,
     item_data: WishlistUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Update a wishlist item"""
+    """Update a wishlist item (a changed URL's image is fetched in the background)"""
     result = await db.execute(
         select(Wishlist).where(
             and_(Wishlist.id == item_id, Wishlist.user_id == current_user.id)
@@ -132,23 +209,29 @@ async def update_wishlist_item(
         item.price = item_data.price
     if item_data.url is not None:
         item.url = item_data.url
+    fetch_image = False
     if item_data.image_url is not None:
         item.image_url = item_data.image_url
+        item.image_status = IMAGE_STATUS_READY
     elif item_data.url is not None:
-        item.image_url = await fetch_open_graph_image(item_data.url)
+        item.image_status = IMAGE_STATUS_PENDING
+        fetch_image = True
     if item_data.notes is not None:
         item.notes = item_data.notes
 
     await db.commit()
     await db.refresh(item)
 
+    if fetch_image:
+        enqueue_image_fetch(item.id, item.url)
+
     return item
 
 
 @router.delete("/{item_id}", status_code=status.HTTP_200_OK)
 async def delete_wishlist_item(
     item_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Delete a wishlist item"""
@@ -175,7 +258,7 @@ async def delete_wishlist_item(
 async def mark_as_purchased(
     item_id: uuid.UUID,
     purchase_data: WishlistPurchase,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_authenticated_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Mark wishlist item as purchased (creates expense and deletes item)"""
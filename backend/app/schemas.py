@@ -1,8 +1,9 @@
-from pydantic import BaseModel, EmailStr, Field, ConfigDict
+from pydantic import BaseModel, EmailStr, Field, ConfigDict, computed_field
 from typing import Optional
 from datetime import date, datetime
 from decimal import Decimal
 import uuid
+from app.thumbnails import thumbnail_path
 
 
 # User Schemas
@@ -123,11 +124,18 @@ class WishlistUpdate(BaseModel):
 class WishlistResponse(WishlistBase):
     id: uuid.UUID
     user_id: uuid.UUID
+    image_status: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
 
+    @computed_field
+    @property
+    def thumbnail_url(self) -> Optional[str]:
+        """Signed path of a locally cached thumbnail of image_url"""
+        return thumbnail_path(self.image_url) if self.image_url else None
+
 
 class WishlistTotal(BaseModel):
     total: Decimal
@@ -139,6 +147,16 @@ class WishlistPurchase(BaseModel):
     category: Optional[str] = "Shopping"
 
 
+class WishlistBatchPurchase(WishlistPurchase):
+    item_ids: list[uuid.UUID] = Field(..., min_length=1, max_length=100)
+
+
+class WishlistBatchPurchaseResult(BaseModel):
+    expense_ids: list[uuid.UUID]
+    purchased_count: int
+    message: str
+
+
 # Income Schemas
 class IncomeBase(BaseModel):
     source: str
@@ -215,6 +233,16 @@ class CategoryBudgetUpsert(BaseModel):
     amount: Optional[Decimal] = None
 
 
+class CategoryBudgetAmount(BaseModel):
+    category_id: uuid.UUID
+    amount: Optional[Decimal] = None
+
+
+class CategoryBudgetBulkUpsert(BaseModel):
+    month: date
+    budgets: list[CategoryBudgetAmount] = Field(..., min_length=1, max_length=200)
+
+
 class CategoryBudgetResponse(BaseModel):
     id: uuid.UUID
     user_id: uuid.UUID
@@ -227,6 +255,17 @@ class CategoryBudgetResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CategoryBudgetProgress(BaseModel):
+    category_id: uuid.UUID
+    category: str
+    icon: str
+    color: str
+    budget: Optional[Decimal] = None
+    spent: Decimal
+    remaining: Optional[Decimal] = None
+    percentage: Optional[float] = None
+
+
 class SavingsUpsert(BaseModel):
     month: date
     amount: Optional[Decimal] = None
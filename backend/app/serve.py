@@ -0,0 +1,201 @@
+"""Production server: preloaded app, one uvicorn worker per CPU, graceful drain.
+
+The parent process imports the app once and binds the listening socket, then
+forks the workers, which share the socket and the already imported code.
+uvloop and httptools are used when installed. On SIGTERM/SIGINT the workers
+stop accepting connections, finish in-flight requests (for up to
+GRACEFUL_SHUTDOWN_SECONDS) and run the lifespan shutdown; workers that die
+unexpectedly are replaced.
+
+Usage:
+    python -m app.serve [--host 0.0.0.0] [--port 8000] [--workers N]
+"""
+import argparse
+import importlib
+import importlib.util
+import logging
+import math
+import os
+import signal
+import socket
+import time
+from typing import Optional
+import uvicorn
+from uvicorn.config import STARTUP_FAILURE
+from app.config import settings
+
+# uvicorn configures this logger, so supervisor messages share its output
+logger = logging.getLogger("uvicorn.error")
+
+# Extra time on top of the graceful shutdown window before workers are killed
+KILL_GRACE_SECONDS = 10.0
+# Don't respawn a crashing worker more often than this
+RESPAWN_INTERVAL_SECONDS = 1.0
+
+# Imported lazily by the app to keep cold starts fast. Every worker ends up
+# needing them, so the supervisor imports them once before forking.
+DEFERRED_IMPORTS = ("jose.jwt", "passlib.context", "passlib.handlers.bcrypt", "httpx")
+
+
+def available_cpus() -> int:
+    """CPUs this process may use, honouring affinity and cgroup v2 CPU quotas"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as cpu_max:
+            quota, period = cpu_max.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def default_workers() -> int:
+    """WEB_CONCURRENCY if set, else one async worker per available CPU"""
+    return settings.WEB_CONCURRENCY or available_cpus()
+
+
+def _first_available(preferred: str, module: str, fallback: str) -> str:
+    return preferred if importlib.util.find_spec(module) else fallback
+
+
+def build_config(host: str, port: int) -> uvicorn.Config:
+    return uvicorn.Config(
+        "app.main:app",
+        host=host,
+        port=port,
+        loop=_first_available("uvloop", "uvloop", "asyncio"),
+        http=_first_available("httptools", "httptools", "h11"),
+        lifespan="on",
+        proxy_headers=True,
+        timeout_graceful_shutdown=settings.GRACEFUL_SHUTDOWN_SECONDS,
+    )
+
+
+class Supervisor:
+    """Forks workers that serve a shared socket and keeps them running"""
+
+    def __init__(self, config: uvicorn.Config, sock: socket.socket, workers: int) -> None:
+        self.config = config
+        self.sock = sock
+        self.workers = workers
+        self.children: set[int] = set()
+        # The one worker that requeues pending wishlist images on startup
+        self.requeue_pid: Optional[int] = None
+        self.stopping = False
+        self.stop_deadline = 0.0
+        self.exit_code = 0
+
+    def spawn(self) -> None:
+        requeue = self.requeue_pid is None
+        pid = os.fork()
+        if pid:
+            self.children.add(pid)
+            if requeue:
+                self.requeue_pid = pid
+            return
+
+        if not requeue:
+            settings.WISHLIST_IMAGE_REQUEUE = False
+
+        # Worker: uvicorn installs its own handlers once serving; ignore signals
+        # until then so an early SIGTERM is not handled by the parent's handler
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, signal.SIG_IGN)
+        code = 0
+        try:
+            uvicorn.Server(self.config).run(sockets=[self.sock])
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else 1
+        except BaseException:
+            logger.exception("Worker %d crashed", os.getpid())
+            code = 1
+        os._exit(code)
+
+    def handle_stop(self, sig: int, frame) -> None:
+        if not self.stopping:
+            logger.info(
+                "Received %s, draining %d workers", signal.Signals(sig).name, len(self.children)
+            )
+            self.stopping = True
+            self.stop_deadline = (
+                time.monotonic() + settings.GRACEFUL_SHUTDOWN_SECONDS + KILL_GRACE_SECONDS
+            )
+        self.signal_children(signal.SIGTERM)
+
+    def signal_children(self, sig: int) -> None:
+        for pid in self.children:
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self.handle_stop)
+        signal.signal(signal.SIGINT, self.handle_stop)
+        for _ in range(self.workers):
+            self.spawn()
+        logger.info(
+            "Serving on %s:%d with %d workers", self.config.host, self.config.port, self.workers
+        )
+
+        last_respawn = 0.0
+        while self.children:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                if self.stopping and time.monotonic() > self.stop_deadline:
+                    logger.warning("Workers did not drain in time; killing them")
+                    self.signal_children(signal.SIGKILL)
+                time.sleep(0.2)
+                continue
+
+            self.children.discard(pid)
+            if pid == self.requeue_pid:
+                # Its replacement takes over, picking up anything it left pending
+                self.requeue_pid = None
+            code = os.waitstatus_to_exitcode(status)
+            if self.stopping:
+                continue
+            if code == STARTUP_FAILURE:
+                logger.error("Worker %d failed to start; shutting down", pid)
+                self.exit_code = STARTUP_FAILURE
+                self.handle_stop(signal.SIGTERM, None)
+                continue
+
+            logger.warning("Worker %d exited with %d; starting a replacement", pid, code)
+            wait = RESPAWN_INTERVAL_SECONDS - (time.monotonic() - last_respawn)
+            if wait > 0:
+                time.sleep(wait)
+            last_respawn = time.monotonic()
+            self.spawn()
+        return self.exit_code
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    parser.add_argument("--workers", type=int, default=None, help="Defaults to the CPU count")
+    args = parser.parse_args()
+
+    workers = args.workers or default_workers()
+    config = build_config(args.host, args.port)
+    # Import the app before forking so workers share its memory pages
+    config.load()
+    logger.info("Using %s event loop and %s HTTP parser", config.loop, config.http)
+
+    if workers == 1:
+        uvicorn.Server(config).run()
+        return
+
+    for module in DEFERRED_IMPORTS:
+        importlib.import_module(module)
+    sock = config.bind_socket()
+    raise SystemExit(Supervisor(config, sock, workers).run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""Local, content-addressed thumbnail cache for third-party images.
+
+Each source image is downloaded once, downscaled to the sizes in THUMBNAIL_SIZES
+and stored under THUMBNAIL_DIR/blobs keyed by the SHA-256 of the original bytes,
+so the same picture behind different URLs is stored once. A small index file per
+source URL (THUMBNAIL_DIR/sources) points at that hash; sources are downloaded
+again once their index is older than THUMBNAIL_SOURCE_TTL_SECONDS, keeping the
+old thumbnail if that fails. Blob mtimes are bumped
+on every read and the least recently used blobs are pruned past
+THUMBNAIL_CACHE_MAX_BYTES.
+
+Image URLs are signed with SECRET_KEY so the endpoint cannot be used as an open
+proxy. The signed URLs are still whatever users saved on their wishlist items,
+so sources are fetched with http_client.stream_public_url, which refuses hosts
+resolving to private, loopback or link-local addresses on every redirect hop.
+"""
+import asyncio
+import hashlib
+import hmac
+import io
+import logging
+import os
+import time
+from pathlib import Path
+from urllib.parse import urlencode, urlparse
+from app.cache import MISSING, TTLCache
+from app.config import settings
+from app.http_client import BlockedURLError, CircuitOpenError, domain_slot, stream_public_url
+
+logger = logging.getLogger(__name__)
+
+# Longest edge in pixels for each size name
+THUMBNAIL_SIZES = {"sm": 160, "md": 480}
+DEFAULT_THUMBNAIL_SIZE = "md"
+THUMBNAIL_MEDIA_TYPE = "image/webp"
+
+PRUNE_INTERVAL_SECONDS = 60.0
+
+# Sources that could not be turned into thumbnails recently
+_failed_sources = TTLCache(maxsize=1024, ttl=600.0, name="thumbnail_failures")
+_source_locks: dict[str, asyncio.Lock] = {}
+# Requests holding or waiting for each lock; it is dropped when the last one leaves
+_source_lock_users: dict[str, int] = {}
+_last_prune = 0.0
+
+
+class ThumbnailError(Exception):
+    """The source could not be fetched or decoded as an image"""
+
+
+def sign_source(src: str) -> str:
+    digest = hmac.new(
+        settings.SECRET_KEY.encode(), f"thumbnail:{src}".encode(), hashlib.sha256
+    )
+    return digest.hexdigest()[:32]
+
+
+def verify_source_signature(src: str, sig: str) -> bool:
+    return hmac.compare_digest(sign_source(src), sig)
+
+
+def thumbnail_path(src: str, size: str = DEFAULT_THUMBNAIL_SIZE) -> str:
+    """Signed API path serving a thumbnail of src"""
+    query = urlencode({"src": src, "size": size, "sig": sign_source(src)})
+    return f"/api/images/thumbnail?{query}"
+
+
+def _root() -> Path:
+    return Path(settings.THUMBNAIL_DIR)
+
+
+def _source_index_path(src: str) -> Path:
+    return _root() / "sources" / hashlib.sha256(src.encode()).hexdigest()
+
+
+def _blob_path(content_hash: str, size: str) -> Path:
+    return _root() / "blobs" / content_hash[:2] / f"{content_hash}-{size}.webp"
+
+
+def _lookup(src: str, size: str, max_age: float | None = None) -> tuple[str, Path] | None:
+    """Return (content hash, blob path) if the thumbnail is on disk, touching it for LRU.
+
+    With max_age, sources downloaded longer ago than that count as missing.
+    """
+    index = _source_index_path(src)
+    try:
+        if max_age is not None and time.time() - index.stat().st_mtime > max_age:
+            return None
+        content_hash = index.read_text().strip()
+    except FileNotFoundError:
+        return None
+    blob = _blob_path(content_hash, size)
+    try:
+        os.utime(blob)
+    except FileNotFoundError:
+        return None
+    return content_hash, blob
+
+
+def _store(src: str, data: bytes) -> str:
+    """Downscale the source to every size, write the blobs and index; returns the hash"""
+    from PIL import Image, ImageOps
+
+    content_hash = hashlib.sha256(data).hexdigest()
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+            for size, edge in THUMBNAIL_SIZES.items():
+                blob = _blob_path(content_hash, size)
+                if blob.exists():
+                    continue
+                thumbnail = image.copy()
+                thumbnail.thumbnail((edge, edge))
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                tmp = blob.with_suffix(".tmp")
+                thumbnail.save(tmp, "WEBP", quality=80)
+                os.replace(tmp, blob)
+    except (OSError, ValueError, Image.DecompressionBombError) as exc:
+        raise ThumbnailError(f"Cannot decode image from {src}") from exc
+
+    index = _source_index_path(src)
+    index.parent.mkdir(parents=True, exist_ok=True)
+    index.write_text(content_hash)
+    return content_hash
+
+
+def prune_thumbnails(max_bytes: int) -> int:
+    """Delete least recently used blobs until the cache fits in max_bytes; returns bytes freed"""
+    blobs = []
+    total = 0
+    for path in (_root() / "blobs").glob("*/*.webp"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        blobs.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+
+    freed = 0
+    for _, size, path in sorted(blobs):
+        if total - freed <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        freed += size
+    # Index entries whose blobs are gone are treated as misses and refetched
+    return freed
+
+
+def _schedule_prune() -> None:
+    global _last_prune
+    if time.monotonic() - _last_prune < PRUNE_INTERVAL_SECONDS:
+        return
+    _last_prune = time.monotonic()
+    task = asyncio.create_task(
+        asyncio.to_thread(prune_thumbnails, settings.THUMBNAIL_CACHE_MAX_BYTES)
+    )
+    task.add_done_callback(_log_prune_failure)
+
+
+def _log_prune_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Thumbnail pruning failed", exc_info=task.exception())
+
+
+async def _download(src: str) -> bytes:
+    import httpx
+
+    parsed = urlparse(src)
+    if parsed.scheme not in {"http", "https"} or not parsed.hostname:
+        raise ThumbnailError("Unsupported image URL")
+
+    try:
+        async with domain_slot(parsed.hostname) as breaker:
+            try:
+                async with stream_public_url(src) as response:
+                    if response.status_code >= 400:
+                        if response.status_code >= 500:
+                            breaker.record_failure()
+                        raise ThumbnailError(f"Image request returned {response.status_code}")
+                    if not response.headers.get("content-type", "").startswith("image/"):
+                        raise ThumbnailError("Source is not an image")
+                    chunks = []
+                    received = 0
+                    async for chunk in response.aiter_bytes():
+                        received += len(chunk)
+                        if received > settings.THUMBNAIL_MAX_SOURCE_BYTES:
+                            raise ThumbnailError("Source image is too large")
+                        chunks.append(chunk)
+            except httpx.HTTPError as exc:
+                breaker.record_failure()
+                raise ThumbnailError("Image request failed") from exc
+            except BlockedURLError as exc:
+                raise ThumbnailError(str(exc)) from exc
+            breaker.record_success()
+    except CircuitOpenError as exc:
+        raise ThumbnailError("Image host is unavailable") from exc
+
+    return b"".join(chunks)
+
+
+async def _stale_thumbnail(src: str, size: str, reason: str) -> tuple[str, Path]:
+    """Previously downloaded thumbnail of src, when a fresh one can't be had"""
+    stale = await asyncio.to_thread(_lookup, src, size)
+    if stale is None:
+        raise ThumbnailError(reason)
+    return stale
+
+
+async def get_thumbnail(src: str, size: str) -> tuple[str, Path]:
+    """Return (content hash, blob path) for a thumbnail, fetching the source if needed"""
+    max_age = settings.THUMBNAIL_SOURCE_TTL_SECONDS
+    cached = await asyncio.to_thread(_lookup, src, size, max_age)
+    if cached:
+        return cached
+    if _failed_sources.get(src) is not MISSING:
+        return await _stale_thumbnail(src, size, "Image recently failed")
+
+    # Concurrent requests for the same source share one download
+    lock = _source_locks.setdefault(src, asyncio.Lock())
+    _source_lock_users[src] = _source_lock_users.get(src, 0) + 1
+    try:
+        async with lock:
+            cached = await asyncio.to_thread(_lookup, src, size, max_age)
+            if cached:
+                return cached
+            try:
+                data = await _download(src)
+                content_hash = await asyncio.to_thread(_store, src, data)
+            except ThumbnailError as exc:
+                _failed_sources.set(src, True)
+                return await _stale_thumbnail(src, size, str(exc))
+    finally:
+        # A released lock may still have a woken waiter that hasn't re-acquired
+        # it, so count users rather than checking lock.locked()
+        _source_lock_users[src] -= 1
+        if not _source_lock_users[src]:
+            del _source_lock_users[src]
+            del _source_locks[src]
+
+    _schedule_prune()
+    return content_hash, _blob_path(content_hash, size)
@@ -0,0 +1,57 @@
+"""Atomic INSERT ... ON CONFLICT DO UPDATE helpers for Postgres and SQLite."""
+import uuid
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def dialect_insert(db: AsyncSession):
+    """Return the dialect's insert() construct, which supports ON CONFLICT"""
+    if db.bind.dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
+
+
+def random_uuid_sql(db: AsyncSession):
+    """SQL expression generating a random UUID in the column's storage format"""
+    if db.bind.dialect.name == "postgresql":
+        return func.gen_random_uuid()
+    # Non-native UUIDs are stored as 32 hex characters
+    return func.lower(func.hex(func.randomblob(16)))
+
+
+async def upsert_rows(
+    db: AsyncSession,
+    model,
+    rows: list[dict],
+    index_elements: list[str],
+    update_columns: list[str],
+) -> list:
+    """Insert rows, updating update_columns where index_elements already exist.
+
+    Runs as a single statement and returns the written rows as ORM objects.
+    Rows must be unique on index_elements; ON CONFLICT cannot touch a row twice.
+    """
+    insert = dialect_insert(db)
+    stmt = insert(model).values([{"id": uuid.uuid4(), **row} for row in rows])
+    set_ = {column: stmt.excluded[column] for column in update_columns}
+    if "updated_at" in model.__table__.c:
+        set_["updated_at"] = func.now()
+    stmt = stmt.on_conflict_do_update(index_elements=index_elements, set_=set_)
+
+    result = await db.execute(
+        stmt.returning(model), execution_options={"populate_existing": True}
+    )
+    return result.scalars().all()
+
+
+async def upsert_row(
+    db: AsyncSession,
+    model,
+    row: dict,
+    index_elements: list[str],
+    update_columns: list[str],
+):
+    """Insert or update a single row and return it"""
+    rows = await upsert_rows(db, model, [row], index_elements, update_columns)
+    return rows[0]
@@ -1,10 +1,18 @@
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from datetime import date, datetime
 from decimal import Decimal
+import codecs
 import html
 import re
-from urllib.parse import urljoin, urlparse
-import httpx
+import time
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+from app.cache import MISSING, TTLCache
+from app.config import settings
+from app.http_client import CircuitOpenError, domain_slot, get_http_client
+from app.metrics import open_graph_fetch_duration
+
+if TYPE_CHECKING:
+    import httpx
 
 
 def format_currency(amount: Decimal) -> str:
@@ -24,41 +32,199 @@ def calculate_percentage(part: Decimal, total: Decimal) -> float:
     return float((part / total) * 100)
 
 
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header lists etag, comparing weakly as RFC 9110 requires"""
+    if not if_none_match:
+        return False
+    etag = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+# Image meta keys in order of preference
+IMAGE_META_KEYS = ("og:image:secure_url", "og:image", "twitter:image")
+_IMAGE_META_RANK = {key: rank for rank, key in enumerate(IMAGE_META_KEYS)}
+
+_META_TAG_RE = re.compile(r"<meta\b[^>]*>", re.IGNORECASE)
+_META_KEY_RE = re.compile(
+    r"""\s(?:property|name)\s*=\s*(?:"([^"]*)"|'([^']*)')""", re.IGNORECASE
+)
+_META_CONTENT_RE = re.compile(
+    r"""\scontent\s*=\s*(?:"([^"]*)"|'([^']*)')""", re.IGNORECASE
+)
+_HEAD_END_RE = re.compile(r"</head\s*>|<body\b", re.IGNORECASE)
+
+# Longest text that could be the start of an unfinished "</head>" marker
+_HEAD_END_OVERLAP = 16
+
+
+def _parse_meta_tag(tag: str) -> tuple[Optional[str], Optional[str]]:
+    """Return the (lowercased key, unescaped content) of a meta tag"""
+    key_match = _META_KEY_RE.search(tag)
+    content_match = _META_CONTENT_RE.search(tag)
+    key = (key_match.group(1) or key_match.group(2) or "").lower() if key_match else None
+    content = None
+    if content_match:
+        content = html.unescape((content_match.group(1) or content_match.group(2) or "").strip())
+    return key, content
+
+
 def _extract_meta_content(html_text: str, key: str) -> Optional[str]:
-    pattern = re.compile(
-        rf'<meta[^>]+(?:property|name)=["\']{re.escape(key)}["\'][^>]*>',
-        re.IGNORECASE,
-    )
-    for match in pattern.finditer(html_text):
-        tag = match.group(0)
-        content_match = re.search(r'content=["\'](.*?)["\']', tag, re.IGNORECASE)
-        if content_match:
-            return html.unescape(content_match.group(1).strip())
+    key = key.lower()
+    for match in _META_TAG_RE.finditer(html_text):
+        tag_key, content = _parse_meta_tag(match.group(0))
+        if tag_key == key and content:
+            return content
     return None
 
 
+class OpenGraphImageParser:
+    """Incremental, single-pass scanner for the preferred image meta tag.
+
+    Text is fed in chunks; only the unscanned tail is kept. Scanning stops at
+    the end of <head> or as soon as the most preferred key is found.
+    """
+
+    def __init__(self) -> None:
+        self.image_url: Optional[str] = None
+        self.done = False
+        self._rank = len(IMAGE_META_KEYS)
+        self._pending = ""
+
+    def feed(self, text: str) -> bool:
+        """Scan more of the document; returns True once nothing better can follow"""
+        if self.done:
+            return True
+        self._pending += text
+
+        head_end = _HEAD_END_RE.search(self._pending)
+        scan_to = head_end.start() if head_end else len(self._pending)
+        scanned_to = 0
+        for match in _META_TAG_RE.finditer(self._pending, 0, scan_to):
+            scanned_to = match.end()
+            key, content = _parse_meta_tag(match.group(0))
+            rank = _IMAGE_META_RANK.get(key, self._rank)
+            if rank < self._rank and content:
+                self._rank, self.image_url = rank, content
+                if rank == 0:
+                    self.done = True
+                    return True
+
+        if head_end:
+            self.done = True
+            return True
+
+        # Keep only what may hold an unfinished tag or head-end marker
+        cut = self._pending.rfind("<", scanned_to)
+        if cut == -1:
+            cut = max(scanned_to, len(self._pending) - _HEAD_END_OVERLAP)
+        self._pending = self._pending[cut:]
+        return False
+
+
+def extract_open_graph_image(html_text: str) -> Optional[str]:
+    """Return the preferred image URL declared in a document's meta tags"""
+    parser = OpenGraphImageParser()
+    parser.feed(html_text)
+    return parser.image_url
+
+
+async def _read_open_graph_image(response: "httpx.Response") -> Optional[str]:
+    """Stream a response body until its image meta tag, </head>, or the byte cap"""
+    try:
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")("replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+
+    parser = OpenGraphImageParser()
+    received = 0
+    async for chunk in response.aiter_bytes():
+        received += len(chunk)
+        if parser.feed(decoder.decode(chunk)) or received >= settings.OG_MAX_HEAD_BYTES:
+            break
+    return parser.image_url
+
+
+# Query parameters that only track the visitor and never change the page
+TRACKING_PARAMS = {"fbclid", "gclid", "msclkid"}
+
+# Open Graph results keyed by normalized URL; None records a failed lookup
+open_graph_cache = TTLCache(
+    maxsize=settings.OG_CACHE_SIZE, ttl=settings.OG_CACHE_TTL_SECONDS, name="open_graph"
+)
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL for cache keys"""
+    parsed = urlparse(url.strip())
+    host = (parsed.hostname or "").lower()
+    default_port = {"http": 80, "https": 443}.get(parsed.scheme.lower())
+    if parsed.port and parsed.port != default_port:
+        host = f"{host}:{parsed.port}"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunparse(
+        (parsed.scheme.lower(), host, parsed.path or "/", "", urlencode(query), "")
+    )
+
+
+async def _scrape_open_graph_image(url: str, domain: str) -> Optional[str]:
+    """Fetch a page and extract its image; raises CircuitOpenError if the domain is failing"""
+    import httpx
+
+    async with domain_slot(domain) as breaker:
+        try:
+            async with get_http_client().stream("GET", url) as response:
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                    return None
+                if response.status_code >= 400:
+                    breaker.record_success()
+                    return None
+                image_url = await _read_open_graph_image(response)
+        except httpx.HTTPError:
+            breaker.record_failure()
+            return None
+        breaker.record_success()
+
+    if not image_url:
+        return None
+
+    return urljoin(url, image_url)
+
+
 async def fetch_open_graph_image(url: str) -> Optional[str]:
     """Fetch og:image or twitter:image for a given URL."""
     parsed = urlparse(url)
-    if parsed.scheme not in {"http", "https"}:
+    if parsed.scheme not in {"http", "https"} or not parsed.hostname:
         return None
-
     try:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=6.0) as client:
-            response = await client.get(url, headers={"User-Agent": "BudgetTracker/1.0"})
-            if response.status_code >= 400:
-                return None
-            html_text = response.text
-    except httpx.HTTPError:
+        parsed.port
+    except ValueError:  # not a number, or out of range
         return None
 
-    image_url = _extract_meta_content(html_text, "og:image:secure_url")
-    if not image_url:
-        image_url = _extract_meta_content(html_text, "og:image")
-    if not image_url:
-        image_url = _extract_meta_content(html_text, "twitter:image")
+    cache_key = normalize_url(url)
+    cached = open_graph_cache.get(cache_key)
+    if cached is not MISSING:
+        return cached
 
-    if not image_url:
+    started = time.perf_counter()
+    try:
+        image_url = await _scrape_open_graph_image(url, parsed.hostname)
+    except CircuitOpenError:
+        # The domain is down; don't cache so the item is retried once it recovers
+        open_graph_fetch_duration.observe(time.perf_counter() - started, "circuit_open")
         return None
+    open_graph_fetch_duration.observe(
+        time.perf_counter() - started, "found" if image_url else "not_found"
+    )
 
-    return urljoin(url, image_url)
+    ttl = None if image_url else settings.OG_NEGATIVE_CACHE_TTL_SECONDS
+    open_graph_cache.set(cache_key, image_url, ttl=ttl)
+    return image_url
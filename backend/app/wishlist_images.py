@@ -0,0 +1,116 @@
+"""Background fetching of Open Graph images for wishlist items.
+
+Items are saved with image_status "pending" and their id queued here. A small
+pool of worker tasks, started in the app lifespan, scrapes the page and writes
+image_url and the final status back, so no request waits on a third-party site.
+"""
+import asyncio
+import logging
+import uuid
+from sqlalchemy import select, update, and_
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import Wishlist
+from app.utils import fetch_open_graph_image
+
+logger = logging.getLogger(__name__)
+
+IMAGE_STATUS_PENDING = "pending"
+IMAGE_STATUS_READY = "ready"
+IMAGE_STATUS_FAILED = "failed"
+
+# Pending items requeued at startup
+STARTUP_REQUEUE_LIMIT = 500
+
+_queue: asyncio.Queue[tuple[uuid.UUID, str]] | None = None
+_workers: list[asyncio.Task] = []
+
+
+def enqueue_image_fetch(item_id: uuid.UUID, url: str) -> bool:
+    """Queue an item for image fetching; returns False if the queue is unavailable.
+
+    Items that cannot be queued stay pending and are picked up on the next
+    startup or by the bulk refresh job.
+    """
+    if _queue is None:
+        return False
+    try:
+        _queue.put_nowait((item_id, url))
+    except asyncio.QueueFull:
+        logger.warning("Wishlist image queue is full; leaving item %s pending", item_id)
+        return False
+    return True
+
+
+async def fetch_and_store_image(item_id: uuid.UUID, url: str) -> None:
+    """Scrape the image for one item and store the outcome"""
+    image_url = await fetch_open_graph_image(url)
+    async with AsyncSessionLocal() as db:
+        # Skip the write if the item's URL changed or the user set an image
+        # while we were fetching
+        await db.execute(
+            update(Wishlist)
+            .where(
+                and_(
+                    Wishlist.id == item_id,
+                    Wishlist.url == url,
+                    Wishlist.image_status == IMAGE_STATUS_PENDING,
+                )
+            )
+            .values(
+                image_url=image_url,
+                image_status=IMAGE_STATUS_READY if image_url else IMAGE_STATUS_FAILED,
+            )
+        )
+        await db.commit()
+
+
+async def _worker() -> None:
+    while True:
+        item_id, url = await _queue.get()
+        try:
+            await fetch_and_store_image(item_id, url)
+        except Exception:
+            logger.exception("Failed to fetch image for wishlist item %s", item_id)
+        finally:
+            _queue.task_done()
+
+
+async def _requeue_pending() -> None:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Wishlist.id, Wishlist.url)
+            .where(
+                and_(
+                    Wishlist.image_status == IMAGE_STATUS_PENDING,
+                    Wishlist.url.is_not(None),
+                )
+            )
+            .limit(STARTUP_REQUEUE_LIMIT)
+        )
+        for item_id, url in result:
+            enqueue_image_fetch(item_id, url)
+
+
+async def start_image_workers() -> None:
+    """Create the queue, start the worker pool and requeue unfinished items.
+
+    Only processes with WISHLIST_IMAGE_REQUEUE set requeue; app.serve turns it
+    off in all workers but one so pending items are not scraped once per worker.
+    """
+    global _queue
+    _queue = asyncio.Queue(maxsize=settings.WISHLIST_IMAGE_QUEUE_SIZE)
+    for _ in range(settings.WISHLIST_IMAGE_WORKERS):
+        _workers.append(asyncio.create_task(_worker()))
+    if settings.WISHLIST_IMAGE_REQUEUE:
+        await _requeue_pending()
+
+
+async def stop_image_workers() -> None:
+    """Cancel the worker pool; unfinished items stay pending in the database"""
+    global _queue
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    _queue = None
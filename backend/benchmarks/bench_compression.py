@@ -0,0 +1,222 @@
+"""Measure bytes saved and CPU spent by response compression per encoding and level.
+
+Compresses representative JSON bodies (a 100-row expense page, a full wishlist
+listing and the dashboard overview) with gzip, brotli and zstd at several
+levels and prints the compressed size, ratio and median compression time. The
+levels marked with * are the ones CompressionMiddleware uses.
+
+Then sends the same bodies through CompressionMiddleware over ASGI, both as a
+single body and as a StreamingResponse, and checks that they decompress to the
+original. brotli and zstd are skipped unless their packages are installed
+(`uv sync --extra compression`).
+
+Usage (from backend/):
+    python benchmarks/bench_compression.py [--rows 100] [--iterations 200]
+"""
+import argparse
+import asyncio
+import gzip
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Nothing is queried; the app only needs settings to import
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter
+from app import compression
+from app.compression import CompressionMiddleware
+from app.models import Wishlist
+from app.schemas import ExpenseResponse, WishlistResponse
+from bench_serialization import build_dashboard, build_expenses
+
+# Maximum levels (br 11, zstd 19) take tens of milliseconds per body and are
+# left out; they only make sense for static assets compressed ahead of time
+LEVELS = {
+    "gzip": (1, 6, 9),
+    "br": (1, 4, 6, 9),
+    "zstd": (1, 3, 6, 10),
+}
+
+
+def build_wishlist(count: int) -> list[Wishlist]:
+    user_id = uuid.uuid4()
+    created = datetime(2026, 9, 14, 8, 0, tzinfo=timezone.utc)
+    return [
+        Wishlist(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            item_name=f"Wishlist item {i}",
+            price=Decimal(f"{(i * 7) % 900 + 10}.99"),
+            url=f"https://shop.example.com/products/{i}-some-product-slug",
+            image_url=f"https://cdn.example.com/images/{uuid.uuid4()}.jpg",
+            notes="Wait for the autumn sale" if i % 3 == 0 else None,
+            image_status="ready",
+            created_at=created,
+            updated_at=None,
+        )
+        for i in range(count)
+    ]
+
+
+def build_payloads(rows: int) -> dict[str, bytes]:
+    expenses = build_expenses(rows)
+    return {
+        f"expenses ({rows} rows)": TypeAdapter(list[ExpenseResponse]).dump_json(
+            TypeAdapter(list[ExpenseResponse]).validate_python(expenses, from_attributes=True)
+        ),
+        f"wishlist ({rows} items)": TypeAdapter(list[WishlistResponse]).dump_json(
+            TypeAdapter(list[WishlistResponse]).validate_python(
+                build_wishlist(rows), from_attributes=True
+            )
+        ),
+        "dashboard overview": build_dashboard(expenses[:10]).model_dump_json().encode(),
+    }
+
+
+def compress_func(encoding: str, level: int):
+    if encoding == "gzip":
+        return lambda body: gzip.compress(body, compresslevel=level)
+    if encoding == "br":
+        return lambda body: compression.brotli.compress(
+            body, mode=compression.brotli.MODE_TEXT, quality=level
+        )
+    return lambda body: compression.zstandard.ZstdCompressor(level=level).compress(body)
+
+
+def decompress(encoding: str, body: bytes) -> bytes:
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "br":
+        return compression.brotli.decompress(body)
+    return compression.zstandard.ZstdDecompressor().decompressobj().decompress(body)
+
+
+def median_us(func, iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.median(timings)
+
+
+def current_level(encoding: str) -> int:
+    return {
+        "gzip": compression.GZIP_LEVEL,
+        "br": compression.BROTLI_QUALITY,
+        "zstd": compression.ZSTD_LEVEL,
+    }[encoding]
+
+
+def print_codec_table(payloads: dict[str, bytes], iterations: int) -> None:
+    for label, body in payloads.items():
+        print(f"{label}: {len(body):,} bytes")
+        for encoding in compression.ENCODINGS:
+            for level in LEVELS[encoding]:
+                func = compress_func(encoding, level)
+                compressed = func(body)
+                assert decompress(encoding, compressed) == body
+                elapsed = median_us(lambda: func(body), iterations)
+                marker = "*" if level == current_level(encoding) else " "
+                print(
+                    f"  {encoding:<4} {level:>2}{marker} {len(compressed):>8,} bytes"
+                    f"  {len(body) / len(compressed):5.1f}x  {elapsed:8.1f} us"
+                    f"  {len(body) / elapsed:6.1f} MB/s"
+                )
+
+
+async def asgi_get(app, path: str, accept_encoding: str) -> tuple[dict, bytes]:
+    """Call the app over ASGI and return (response headers, raw body)"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+        "client": ("127.0.0.1", 1234), "server": ("127.0.0.1", 80),
+    }
+    headers: dict = {}
+    body = []
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if requested:
+            # StreamingResponse listens for a disconnect while it streams
+            await asyncio.Event().wait()
+        requested = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            headers.update((k.decode(), v.decode()) for k, v in message["headers"])
+        elif message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return headers, b"".join(body)
+
+
+def build_app(body: bytes, chunk_size: int = 4096) -> CompressionMiddleware:
+    app = FastAPI()
+
+    @app.get("/body")
+    async def whole():
+        return Response(body, media_type="application/json")
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for offset in range(0, len(body), chunk_size):
+                yield body[offset:offset + chunk_size]
+
+        return StreamingResponse(chunks(), media_type="application/json")
+
+    return CompressionMiddleware(app)
+
+
+def print_middleware_table(payloads: dict[str, bytes], iterations: int) -> None:
+    print("through CompressionMiddleware over ASGI (median per request)")
+    for label, body in payloads.items():
+        app = build_app(body)
+        print(f"  {label}")
+        for path in ("/body", "/stream"):
+            for encoding in ("identity", *compression.ENCODINGS):
+                headers, raw = asyncio.run(asgi_get(app, path, encoding))
+                sent = headers.get("content-encoding", "identity")
+                assert sent == encoding, (sent, encoding)
+                assert (raw if sent == "identity" else decompress(sent, raw)) == body
+
+                async def run_many() -> list[float]:
+                    timings = []
+                    for _ in range(iterations):
+                        start = time.perf_counter()
+                        await asgi_get(app, path, encoding)
+                        timings.append((time.perf_counter() - start) * 1_000_000)
+                    return timings
+
+                elapsed = statistics.median(asyncio.run(run_many()))
+                print(f"    {path:<8} {encoding:<9} {len(raw):>8,} bytes  {elapsed:8.1f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    payloads = build_payloads(args.rows)
+    print_codec_table(payloads, args.iterations)
+    print_middleware_table(payloads, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Measure per-query latency with and without asyncpg prepared statement caching.
+
+Runs the same parameterized query (shaped like the expense listing) repeatedly on
+one pooled connection, first with the pgBouncer-safe settings (statement caches
+disabled) and then with asyncpg's caches enabled, and prints latency percentiles.
+Requires a PostgreSQL DATABASE_URL reached directly, not through pgBouncer.
+
+Usage (from backend/):
+    python benchmarks/bench_db_statements.py [--iterations 2000]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.config import settings
+from app.database import engine_options
+from app.models import Expense
+
+
+async def run(pgbouncer: bool, iterations: int) -> list[float]:
+    settings.DB_PGBOUNCER = pgbouncer
+    engine = create_async_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+    query = (
+        select(Expense)
+        .where(Expense.user_id == uuid.uuid4())
+        .order_by(Expense.date.desc())
+        .limit(100)
+    )
+    timings = []
+    try:
+        async with engine.connect() as conn:
+            for _ in range(iterations):
+                start = time.perf_counter()
+                await conn.execute(query)
+                timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        await engine.dispose()
+    return timings
+
+
+def summarize(label: str, timings: list[float]) -> float:
+    timings = sorted(timings)
+    p50 = statistics.median(timings)
+    p95 = timings[int(len(timings) * 0.95)]
+    print(f"{label:<28} mean {statistics.fmean(timings):6.3f} ms  p50 {p50:6.3f} ms  p95 {p95:6.3f} ms")
+    return p50
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    if not settings.DATABASE_URL.startswith("postgresql"):
+        sys.exit("DATABASE_URL must point at PostgreSQL (asyncpg) for this benchmark")
+
+    settings.DB_ECHO = False
+    uncached = await run(pgbouncer=True, iterations=args.iterations)
+    cached = await run(pgbouncer=False, iterations=args.iterations)
+
+    uncached_p50 = summarize("statement cache off", uncached)
+    cached_p50 = summarize("statement cache on", cached)
+    print(f"p50 saving per query: {uncached_p50 - cached_p50:.3f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
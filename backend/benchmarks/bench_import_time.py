@@ -0,0 +1,104 @@
+"""Measure how long `import app.main` takes in a fresh interpreter.
+
+Runs `python -X importtime -c "import app.main"` several times, then prints the
+median total and the slowest modules by cumulative time. It also checks that
+modules the app defers until first use (httpx, jose, passlib, PIL) are not
+imported at startup.
+
+Exits with status 1 if the median exceeds --budget-ms or a deferred module was
+imported eagerly, so it can guard against regressions in CI:
+
+    python benchmarks/bench_import_time.py --budget-ms 1500
+
+Usage (from backend/):
+    python benchmarks/bench_import_time.py [--runs 7] [--top 15] [--budget-ms N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imported on first use by app.auth, app.http_client, app.utils and app.thumbnails
+DEFERRED_MODULES = ("httpx", "jose", "passlib", "PIL")
+
+
+def import_profile() -> dict[str, tuple[int, int, int]]:
+    """{module: (self us, cumulative us, depth)} for one fresh `import app.main`"""
+    env = {
+        **os.environ,
+        # Nothing connects; the engines only need a URL to be created
+        "DATABASE_URL": os.environ.get("DATABASE_URL", "sqlite+aiosqlite:///:memory:"),
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "benchmark"),
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail above this median")
+    args = parser.parse_args()
+
+    totals = []
+    cumulative = defaultdict(list)
+    eager = set()
+    for _ in range(args.runs):
+        modules = import_profile()
+        totals.append(modules["app.main"][1] / 1000)
+        for name, (_, cumulative_us, depth) in modules.items():
+            # Direct imports of app.main and anything from our own package
+            if depth <= 1 or name.startswith("app."):
+                cumulative[name].append(cumulative_us / 1000)
+        eager.update(
+            name for name in modules if name.split(".")[0] in DEFERRED_MODULES
+        )
+
+    median_total = statistics.median(totals)
+    print(
+        f"import app.main: median {median_total:.0f} ms over {args.runs} runs "
+        f"(min {min(totals):.0f}, max {max(totals):.0f})"
+    )
+    print("slowest modules (median cumulative ms):")
+    slowest = sorted(
+        ((statistics.median(times), name) for name, times in cumulative.items()
+         if name != "app.main"),
+        reverse=True,
+    )
+    for elapsed, name in slowest[: args.top]:
+        print(f"  {elapsed:8.1f}  {name}")
+
+    failed = False
+    eager_roots = sorted({name.split(".")[0] for name in eager})
+    if eager_roots:
+        print(f"deferred modules imported at startup: {', '.join(eager_roots)}")
+        failed = True
+    else:
+        print(f"deferred modules not imported: {', '.join(DEFERRED_MODULES)}")
+    if args.budget_ms is not None and median_total > args.budget_ms:
+        print(f"over budget: {median_total:.0f} ms > {args.budget_ms:.0f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
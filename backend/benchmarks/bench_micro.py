@@ -0,0 +1,182 @@
+"""Microbenchmarks for helpers and schemas on the per-request path, with regression checks.
+
+Times each function with timeit (auto-ranged loop count, best of --repeat runs)
+and prints nanoseconds per call:
+
+    auth.create_access_token        sign a JWT for a user
+    auth.decode_token               verify and decode one
+    dashboard.shift_month           month arithmetic used by the dashboard
+    utils.calculate_percentage      Decimal percentage used by budgets/dashboard
+    utils.extract_meta_content      meta tag lookup in a product page <head>
+    schemas.expense_round_trip      ExpenseCreate from request JSON, then an
+                                    ExpenseResponse from the stored row, dumped
+    schemas.dashboard_overview_dump DashboardOverview to JSON
+
+--save writes the results to a baseline file. --compare re-runs the
+benchmarks, prints the change against that file and exits with status 1 if
+any benchmark is slower by more than --threshold. Timings only compare on the
+same machine, so keep the baseline local (the default path is git-ignored) or
+create it on the CI runner before the change under test.
+
+Usage (from backend/):
+    python benchmarks/bench_micro.py --save
+    python benchmarks/bench_micro.py --compare [--threshold 0.10]
+    python benchmarks/bench_micro.py --filter auth.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+import uuid
+from collections.abc import Callable
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-of-reasonable-length")
+
+from app.auth import create_access_token, decode_token
+from app.models import Expense
+from app.routers.dashboard import shift_month
+from app.schemas import ExpenseCreate, ExpenseResponse
+from app.utils import _extract_meta_content, calculate_percentage
+from bench_serialization import build_dashboard, build_expenses
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(BACKEND_DIR, ".micro_baseline.json")
+
+PRODUCT_PAGE_HEAD = (
+    "<!doctype html><html><head><meta charset='utf-8'>"
+    "<title>Trail running shoes | Example Shop</title>"
+    + "".join(
+        f'<meta name="keywords-{i}" content="running, trail, shoes, outdoor {i}">'
+        for i in range(40)
+    )
+    + '<link rel="stylesheet" href="/assets/site.css">'
+    + '<meta property="og:title" content="Trail running shoes">'
+    + '<meta property="og:image" content="https://cdn.example.com/p/123/large.jpg">'
+    + "<script>window.dataLayer = window.dataLayer || [];</script></head>"
+)
+
+
+def benchmarks() -> dict[str, Callable[[], object]]:
+    """name -> zero-argument callable"""
+    claims = {"sub": str(uuid.uuid4()), "ver": 0, "active": True}
+    token = create_access_token(claims)
+    today = date(2026, 10, 19)
+
+    expense_body = json.dumps(
+        {"amount": "42.50", "category": "Food", "date": "2026-10-19", "description": "Lunch"}
+    )
+    stored = Expense(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        amount=Decimal("42.50"),
+        category="Food",
+        date=today,
+        description="Lunch",
+        created_at=datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc),
+        updated_at=None,
+    )
+
+    def expense_round_trip() -> bytes:
+        ExpenseCreate.model_validate_json(expense_body)
+        return ExpenseResponse.model_validate(stored).model_dump_json()
+
+    overview = build_dashboard(build_expenses(10))
+
+    return {
+        "auth.create_access_token": lambda: create_access_token(claims),
+        "auth.decode_token": lambda: decode_token(token),
+        "dashboard.shift_month": lambda: shift_month(today, -5),
+        "utils.calculate_percentage": lambda: calculate_percentage(
+            Decimal("123.45"), Decimal("987.65")
+        ),
+        "utils.extract_meta_content": lambda: _extract_meta_content(
+            PRODUCT_PAGE_HEAD, "og:image"
+        ),
+        "schemas.expense_round_trip": expense_round_trip,
+        "schemas.dashboard_overview_dump": overview.model_dump_json,
+    }
+
+
+def time_ns(func, repeat: int) -> float:
+    """Best time per call in nanoseconds"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def run(name_filter: str, repeat: int) -> dict[str, float]:
+    results = {}
+    for name, func in benchmarks().items():
+        if name_filter in name:
+            results[name] = time_ns(func, repeat)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", default="", help="Only run benchmarks containing this")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file")
+    parser.add_argument("--save", action="store_true", help="Write results to the baseline")
+    parser.add_argument("--compare", action="store_true", help="Compare with the baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10, help="Allowed slowdown (0.10 = 10%%)"
+    )
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        try:
+            with open(args.baseline) as baseline_file:
+                baseline = json.load(baseline_file)["results"]
+        except FileNotFoundError:
+            sys.exit(f"No baseline at {args.baseline}; run with --save first")
+
+    results = run(args.filter, args.repeat)
+    regressions = []
+    for name, elapsed in results.items():
+        line = f"{name:<34} {elapsed:12,.0f} ns"
+        previous = baseline.get(name)
+        if previous:
+            change = elapsed / previous - 1
+            line += f"  {previous:12,.0f} ns  {change:+7.1%}"
+            if change > args.threshold:
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+
+    if args.save:
+        saved = {}
+        if args.filter and os.path.exists(args.baseline):
+            # Keep the benchmarks that were filtered out of this run
+            with open(args.baseline) as baseline_file:
+                saved = json.load(baseline_file)["results"]
+        saved.update((name, round(value, 1)) for name, value in results.items())
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                    "results": saved,
+                },
+                baseline_file,
+                indent=2,
+            )
+        print(f"baseline written to {args.baseline}")
+    if regressions:
+        print(
+            f"{len(regressions)} regression(s) past {args.threshold:.0%}: "
+            f"{', '.join(regressions)}"
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
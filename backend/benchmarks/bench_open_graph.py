@@ -0,0 +1,110 @@
+"""Compare full-body and streaming head-only Open Graph image extraction.
+
+Builds a product page of realistic size (large <head>, ~1.5 MB body) and measures,
+for each strategy, the median time to find the image and the peak memory
+allocated while doing so.
+
+Usage (from backend/):
+    python benchmarks/bench_open_graph.py [--body-kb 1500] [--iterations 50]
+"""
+import argparse
+import codecs
+import html
+import os
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils import OpenGraphImageParser
+
+CHUNK_SIZE = 16384
+
+
+def build_page(body_kb: int) -> bytes:
+    """A page shaped like a typical shop product page"""
+    head = ["<!doctype html><html><head><meta charset='utf-8'><title>Product</title>"]
+    for i in range(150):
+        head.append(f'<link rel="preload" href="/static/chunk-{i}.js" as="script">')
+        head.append(f'<meta name="x-tag-{i}" content="value {i}">')
+    head.append("<script type='application/ld+json'>" + "{\"k\": \"v\"}," * 2000 + "</script>")
+    head.append('<meta property="og:title" content="A product">')
+    head.append('<meta property="og:image" content="https://cdn.example.com/p/large.jpg">')
+    head.append('<meta name="twitter:image" content="https://cdn.example.com/p/tw.jpg">')
+    head.append("</head>")
+    row = "<div class='item'><span>Lorem ipsum dolor sit amet</span></div>\n"
+    body = "<body>" + row * (body_kb * 1024 // len(row)) + "</body></html>"
+    return ("".join(head) + body).encode()
+
+
+def legacy_extract(page: bytes) -> str | None:
+    """The previous implementation: decode everything, then one regex scan per key"""
+    html_text = page.decode("utf-8")
+
+    def extract(key: str) -> str | None:
+        pattern = re.compile(
+            rf'<meta[^>]+(?:property|name)=["\']{re.escape(key)}["\'][^>]*>',
+            re.IGNORECASE,
+        )
+        for match in pattern.finditer(html_text):
+            content_match = re.search(r'content=["\'](.*?)["\']', match.group(0), re.IGNORECASE)
+            if content_match:
+                return html.unescape(content_match.group(1).strip())
+        return None
+
+    return extract("og:image:secure_url") or extract("og:image") or extract("twitter:image")
+
+
+def streaming_extract(page: bytes) -> str | None:
+    """The current implementation, fed in network-sized chunks"""
+    decoder = codecs.getincrementaldecoder("utf-8")("replace")
+    parser = OpenGraphImageParser()
+    for offset in range(0, len(page), CHUNK_SIZE):
+        if parser.feed(decoder.decode(page[offset : offset + CHUNK_SIZE])):
+            break
+    return parser.image_url
+
+
+def measure(func, page: bytes, iterations: int) -> tuple[float, float]:
+    """Return (median ms, peak KiB) for one strategy"""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func(page)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    func(page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--body-kb", type=int, default=1500)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    page = build_page(args.body_kb)
+    head_bytes = page.index(b"</head>") + len(b"</head>")
+    assert legacy_extract(page) == streaming_extract(page)
+
+    print(f"page: {len(page) / 1024:.0f} KiB total, {head_bytes / 1024:.0f} KiB <head>")
+    print(f"{'strategy':<12} {'median ms':>10} {'peak KiB':>10}")
+    results = {}
+    for name, func in (("full-body", legacy_extract), ("streaming", streaming_extract)):
+        results[name] = measure(func, page, args.iterations)
+        median_ms, peak_kib = results[name]
+        print(f"{name:<12} {median_ms:>10.2f} {peak_kib:>10.0f}")
+
+    (full_ms, full_kib), (stream_ms, stream_kib) = results["full-body"], results["streaming"]
+    print(f"speedup {full_ms / stream_ms:.1f}x, memory {full_kib / stream_kib:.1f}x lower")
+    print("(the full-body strategy also downloads the whole page; streaming stops at </head>)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Count round trips for a read-only request with transactional vs read-only sessions.
+
+A GET request is simulated as the user lookup done by authentication followed by
+the expense listing query, run either the old way (one transactional session,
+committed at the end as get_db does) or through the AUTOCOMMIT read-only
+sessions used by get_authenticated_user and get_read_db. Prints the statements
+and transaction control commands sent per request and the latency percentiles.
+
+Works against any DATABASE_URL; the round-trip saving is what PostgreSQL pays
+for BEGIN and COMMIT (SQLite's driver skips BEGIN for plain reads).
+
+Usage (from backend/):
+    python benchmarks/bench_read_session.py [--iterations 1000]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, select
+from app.config import settings
+from app.database import AsyncSessionLocal, Base, PrimaryReadSessionLocal, engine
+from app.models import Expense, User
+
+
+def count_round_trips(counter: Counter) -> None:
+    """Tally statements and transaction commands that reach the driver"""
+
+    def on_statement(conn, cursor, statement, parameters, context, executemany):
+        counter["statements"] += 1
+
+    def on_transaction(name: str):
+        def listener(conn):
+            # In AUTOCOMMIT mode the driver sends nothing for these
+            if not conn._is_autocommit_isolation():
+                counter[name] += 1
+
+        return listener
+
+    event.listen(engine.sync_engine, "before_cursor_execute", on_statement)
+    for name in ("begin", "commit", "rollback"):
+        event.listen(engine.sync_engine, name, on_transaction(name))
+
+
+async def simulated_request(read_only: bool, user_id: uuid.UUID) -> None:
+    user_query = select(User).where(User.id == user_id)
+    expense_query = (
+        select(Expense)
+        .where(Expense.user_id == user_id)
+        .order_by(Expense.date.desc())
+        .limit(100)
+    )
+    if read_only:
+        async with PrimaryReadSessionLocal() as db:
+            await db.execute(user_query)
+        async with PrimaryReadSessionLocal() as db:
+            (await db.execute(expense_query)).scalars().all()
+    else:
+        async with AsyncSessionLocal() as db:
+            await db.execute(user_query)
+            (await db.execute(expense_query)).scalars().all()
+            await db.commit()
+
+
+async def run(read_only: bool, iterations: int, counter: Counter) -> list[float]:
+    user_id = uuid.uuid4()
+    await simulated_request(read_only, user_id)  # warm up the pool
+    counter.clear()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await simulated_request(read_only, user_id)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def summarize(label: str, timings: list[float], counter: Counter, iterations: int) -> None:
+    timings = sorted(timings)
+    per_request = ", ".join(
+        f"{name} {counter[name] / iterations:.0f}"
+        for name in ("statements", "begin", "commit", "rollback")
+    )
+    p50 = statistics.median(timings)
+    p95 = timings[int(len(timings) * 0.95)]
+    print(f"{label:<14} per request: {per_request}")
+    print(f"{'':<14} p50 {p50:6.3f} ms  p95 {p95:6.3f} ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    if not settings.DATABASE_URL:
+        sys.exit("Set DATABASE_URL")
+    if settings.DATABASE_URL.startswith("sqlite"):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    counter = Counter()
+    count_round_trips(counter)
+    try:
+        for label, read_only in (("transactional", False), ("read-only", True)):
+            timings = await run(read_only, args.iterations, counter)
+            summarize(label, timings, counter, args.iterations)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,221 @@
+"""Compare FastAPI's default response serialization with the FAST_JSON path.
+
+Serializes a 100-row expense page and a dashboard overview (6-month category
+matrix, recent transactions) several ways and prints the median time per
+response:
+
+    validate+stdlib   validate rows into response models, jsonable_encoder,
+                      json.dumps (what FastAPI does by default)
+    validate+orjson   the same, encoded by ORJSONResponse
+    trusted+orjson    column values copied from the rows into dicts, encoded by
+                      orjson (trusted_list_response)
+    dump_json         an already built model dumped by pydantic-core
+                      (model_response; dashboard only)
+
+and the same two endpoints end to end through a FastAPI app called over ASGI.
+All strategies are checked to produce the same JSON document.
+
+Usage (from backend/):
+    python benchmarks/bench_serialization.py [--rows 100] [--iterations 500]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Nothing is queried; the app only needs settings to import
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from app.config import settings
+from app.models import Expense
+from app.responses import (
+    ORJSONResponse,
+    dumps,
+    model_response,
+    trusted_list_response,
+    trusted_values,
+)
+from app.schemas import (
+    CategorySummary,
+    DashboardOverview,
+    ExpenseResponse,
+    MonthlyAmount,
+    MonthlyCategorySpend,
+)
+
+CATEGORIES = ["Food", "Transport", "Rent", "Utilities", "Fun", "Health",
+              "Clothes", "Gifts", "Travel", "Education", "Pets", "Other"]
+
+
+def build_expenses(count: int) -> list[Expense]:
+    user_id = uuid.uuid4()
+    created = datetime(2026, 10, 1, 12, 30, tzinfo=timezone.utc)
+    return [
+        Expense(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            amount=Decimal(f"{(i % 500) + 1}.{i % 100:02d}"),
+            category=CATEGORIES[i % len(CATEGORIES)],
+            date=date(2026, 10, (i % 28) + 1),
+            description=f"Expense number {i}",
+            created_at=created,
+            updated_at=None,
+        )
+        for i in range(count)
+    ]
+
+
+def build_dashboard(recent: list[Expense]) -> DashboardOverview:
+    months = [date(2026, month, 1) for month in range(5, 11)]
+    return DashboardOverview(
+        total_expenses_month=Decimal("1234.56"),
+        income_total_month=Decimal("4000.00"),
+        net_balance_month=Decimal("2765.44"),
+        expenses_mom_percentage=-3.2,
+        income_mom_percentage=None,
+        expenses_by_category=[
+            CategorySummary(category=name, total=Decimal("102.88"), percentage=8.33)
+            for name in CATEGORIES
+        ],
+        monthly_category_spend=[
+            MonthlyCategorySpend(month=month, category=name, total=Decimal("99.10"))
+            for month in months
+            for name in CATEGORIES
+        ],
+        monthly_income=[MonthlyAmount(month=month, total=Decimal("4000.00")) for month in months],
+        monthly_savings=[MonthlyAmount(month=month, total=Decimal("500.00")) for month in months],
+        recent_transactions=[ExpenseResponse.model_validate(row) for row in recent],
+        wishlist_total=Decimal("899.99"),
+        wishlist_count=7,
+    )
+
+
+def median_us(func, iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.median(timings)
+
+
+async def asgi_get(app: FastAPI, path: str) -> bytes:
+    """Call the app directly over ASGI and return the response body"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"", "headers": [],
+        "client": ("127.0.0.1", 1234), "server": ("127.0.0.1", 80),
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+def build_app(rows: list[Expense], overview: DashboardOverview, fast: bool) -> FastAPI:
+    app = FastAPI(default_response_class=ORJSONResponse if fast else JSONResponse)
+
+    @app.get("/expenses", response_model=list[ExpenseResponse])
+    async def expenses():
+        return trusted_list_response(ExpenseResponse, rows) if fast else rows
+
+    @app.get("/dashboard", response_model=DashboardOverview)
+    async def dashboard():
+        return model_response(overview) if fast else overview
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+    settings.FAST_JSON = True
+
+    rows = build_expenses(args.rows)
+    overview = build_dashboard(rows[:10])
+    adapter = TypeAdapter(list[ExpenseResponse])
+
+    list_strategies = {
+        "validate+stdlib": lambda: json.dumps(
+            jsonable_encoder(adapter.validate_python(rows, from_attributes=True))
+        ).encode(),
+        "validate+orjson": lambda: dumps(
+            jsonable_encoder(adapter.validate_python(rows, from_attributes=True))
+        ),
+        "trusted+orjson": lambda: dumps(
+            [trusted_values(ExpenseResponse, row) for row in rows]
+        ),
+    }
+    dashboard_strategies = {
+        "validate+stdlib": lambda: json.dumps(
+            jsonable_encoder(DashboardOverview.model_validate(overview.model_dump()))
+        ).encode(),
+        "validate+orjson": lambda: dumps(
+            jsonable_encoder(DashboardOverview.model_validate(overview.model_dump()))
+        ),
+        "dump_json": lambda: overview.model_dump_json().encode(),
+    }
+
+    for label, strategies in (
+        (f"expense list ({args.rows} rows)", list_strategies),
+        ("dashboard overview", dashboard_strategies),
+    ):
+        outputs = {name: json.loads(func()) for name, func in strategies.items()}
+        assert all(output == outputs["validate+stdlib"] for output in outputs.values())
+        print(label)
+        baseline = None
+        for name, func in strategies.items():
+            elapsed = median_us(func, args.iterations)
+            baseline = baseline or elapsed
+            print(f"  {name:<16} {elapsed:9.1f} us  {baseline / elapsed:5.2f}x")
+
+    print("end to end over ASGI")
+    default_app = build_app(rows, overview, fast=False)
+    fast_app = build_app(rows, overview, fast=True)
+    for path in ("/expenses", "/dashboard"):
+        assert json.loads(asyncio.run(asgi_get(default_app, path))) == json.loads(
+            asyncio.run(asgi_get(fast_app, path))
+        )
+        results = {}
+        for name, app in (("default", default_app), ("FAST_JSON", fast_app)):
+
+            async def run_many(app=app) -> list[float]:
+                timings = []
+                for _ in range(args.iterations):
+                    start = time.perf_counter()
+                    await asgi_get(app, path)
+                    timings.append((time.perf_counter() - start) * 1_000_000)
+                return timings
+
+            results[name] = statistics.median(asyncio.run(run_many()))
+        speedup = results["default"] / results["FAST_JSON"]
+        print(
+            f"  {path:<12} default {results['default']:9.1f} us  "
+            f"FAST_JSON {results['FAST_JSON']:9.1f} us  {speedup:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
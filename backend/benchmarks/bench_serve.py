@@ -0,0 +1,129 @@
+"""Measure requests/sec per core of the production server (python -m app.serve).
+
+Starts the server with the given number of workers on a local port, waits for
+/health, then keeps --concurrency requests in flight per client process for
+--duration seconds and prints throughput, throughput per worker and latency
+percentiles. Set DATABASE_URL and SECRET_KEY as for the server itself; pass
+--token to benchmark an authenticated route.
+
+The load generator runs on the same machine, so leave it cores of its own
+(e.g. --workers 2 on a 4-core host) or point an external tool such as
+`oha` or `wrk` at a server started separately.
+
+Usage (from backend/):
+    python benchmarks/bench_serve.py --workers 2 --path /health
+    python benchmarks/bench_serve.py --workers 2 --path /api/categories/ --token <jwt>
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import time
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def wait_until_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Server did not become ready")
+
+
+async def drive(
+    url: str, headers: dict, concurrency: int, duration: float
+) -> tuple[int, int, list[float]]:
+    """Return (successes, errors, latencies in ms) for one client process"""
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, headers=headers) as client:
+
+        async def loop() -> None:
+            nonlocal errors
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append((time.perf_counter() - start) * 1000)
+                else:
+                    errors += 1
+
+        await asyncio.gather(*(loop() for _ in range(concurrency)))
+    return len(latencies), errors, latencies
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def client_process(args: tuple) -> tuple[int, int, list[float]]:
+    return asyncio.run(drive(*args))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--token", default=None, help="Bearer token for authenticated paths")
+    parser.add_argument("--concurrency", type=int, default=32, help="In-flight requests per client")
+    parser.add_argument("--clients", type=int, default=1, help="Load generator processes")
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "app.serve",
+            "--host", "127.0.0.1",
+            "--port", str(args.port),
+            "--workers", str(args.workers),
+        ],
+        cwd=BACKEND_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(base_url)
+        headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+        job = (f"{base_url}{args.path}", headers, args.concurrency, args.duration)
+        with multiprocessing.Pool(args.clients) as pool:
+            results = pool.map(client_process, [job] * args.clients)
+    finally:
+        server.terminate()
+        server.wait()
+
+    successes = sum(result[0] for result in results)
+    errors = sum(result[1] for result in results)
+    latencies = sorted(latency for result in results for latency in result[2])
+    if not latencies:
+        sys.exit(f"No successful requests ({errors} errors)")
+
+    throughput = successes / args.duration
+    print(f"{args.path} with {args.workers} workers, {args.clients * args.concurrency} in flight")
+    print(f"  {throughput:,.0f} req/s total, {throughput / args.workers:,.0f} req/s per worker")
+    print(
+        f"  p50 {statistics.median(latencies):.1f} ms"
+        f"  p95 {percentile(latencies, 0.95):.1f} ms"
+        f"  p99 {percentile(latencies, 0.99):.1f} ms  errors {errors}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Check the number of SQL statements each endpoint runs against pinned counts.
+
+Calls every /api route, plus /health, in-process against a throwaway SQLite
+database: register and log in, then create, read, update and delete each kind
+of record, and finally reset the password. Every request runs inside
+app.instrumentation.assert_query_count with the count pinned in STEPS, and the
+script exits with status 1 if any request runs a different number of
+statements. On a mismatch the statements that ran are listed.
+
+Relationships are lazy="raise", so an accidental lazy load fails the request
+outright. This check catches the other kind of regression: a query added to a
+route, or a loop that queries per row. tests/test_query_counts.py pins the same
+counts; when a change alters one on purpose, update both in the same commit.
+
+Usage (from backend/):
+    python benchmarks/check_query_counts.py [--verbose]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///" + os.path.join(
+    tempfile.mkdtemp(prefix="query-counts-"), "query_counts.db"
+)
+os.environ["DATABASE_READ_URL"] = ""
+os.environ.setdefault("SECRET_KEY", "query-count-secret-key-of-reasonable-length")
+
+import httpx
+from app.database import Base, engine
+from app.instrumentation import assert_query_count, normalize_sql
+from app.main import app
+
+EMAIL = "query-counts@example.com"
+PASSWORD = "query-count-password"
+MONTH = "2026-10-01"
+NEXT_MONTH = "2026-11-01"
+
+# (name, method, path, JSON body, key to save a response field under, statements)
+# The key is "name" to save the response's id, or "name:field". Paths and
+# bodies may refer to saved values as {name}.
+STEPS = [
+    ("register", "POST", "/api/auth/register", {"email": EMAIL, "password": PASSWORD}, None, 3),
+    ("login", "POST", "/api/auth/login", {"email": EMAIL, "password": PASSWORD}, None, 1),
+    ("refresh", "POST", "/api/auth/refresh", {"refresh_token": "{refresh_token}"}, None, 1),
+    ("list_categories", "GET", "/api/categories/", None, None, 2),
+    ("default_categories", "GET", "/api/categories/defaults", None, None, 0),
+    (
+        "create_category", "POST", "/api/categories/",
+        {"name": "Coffee", "icon": "cup", "color": "#6f4e37"}, "category_id", 4,
+    ),
+    ("update_category", "PUT", "/api/categories/{category_id}", {"color": "#000000"}, None, 4),
+    (
+        "upsert_budget", "PUT", "/api/budgets/",
+        {"category_id": "{category_id}", "month": MONTH, "amount": "150.00"}, None, 3,
+    ),
+    (
+        "bulk_upsert_budgets", "PUT", "/api/budgets/bulk",
+        {"month": MONTH, "budgets": [{"category_id": "{category_id}", "amount": "175.00"}]},
+        None, 3,
+    ),
+    ("copy_budgets", "POST", f"/api/budgets/copy?from={MONTH}&to={NEXT_MONTH}", None, None, 2),
+    ("list_budgets", "GET", "/api/budgets/?month=" + MONTH, None, None, 2),
+    ("budget_progress", "GET", "/api/budgets/progress?month=" + MONTH, None, None, 2),
+    (
+        "create_expense", "POST", "/api/expenses/",
+        {"amount": "4.20", "category": "Coffee", "date": "2026-10-19", "description": "Flat white"},
+        "expense_id", 3,
+    ),
+    ("list_expenses", "GET", "/api/expenses/", None, None, 2),
+    ("expense_stats", "GET", "/api/expenses/stats", None, None, 2),
+    ("get_expense", "GET", "/api/expenses/{expense_id}", None, None, 2),
+    (
+        "update_expense", "PUT", "/api/expenses/{expense_id}",
+        {"amount": "4.50", "category": "Coffee", "date": "2026-10-19"}, None, 4,
+    ),
+    (
+        "create_income", "POST", "/api/incomes/",
+        {"source": "Salary", "amount": "3000.00", "date": "2026-10-01"}, "income_id", 3,
+    ),
+    ("list_incomes", "GET", "/api/incomes/", None, None, 2),
+    ("get_income", "GET", "/api/incomes/{income_id}", None, None, 2),
+    ("update_income", "PUT", "/api/incomes/{income_id}", {"amount": "3100.00"}, None, 4),
+    ("income_total", "GET", "/api/incomes/total", None, None, 2),
+    (
+        "create_wishlist_item", "POST", "/api/wishlist/",
+        {"item_name": "Grinder", "price": "89.00"}, "item_id", 3,
+    ),
+    (
+        "create_wishlist_item_with_image", "POST", "/api/wishlist/",
+        {"item_name": "Kettle", "price": "45.00", "image_url": "http://127.0.0.1:9/kettle.jpg"},
+        "thumbnail_url:thumbnail_url", 3,
+    ),
+    (
+        "create_wishlist_item_to_delete", "POST", "/api/wishlist/",
+        {"item_name": "Scale", "price": "20.00"}, "deleted_item_id", 3,
+    ),
+    ("list_wishlist", "GET", "/api/wishlist/", None, None, 2),
+    ("wishlist_total", "GET", "/api/wishlist/total", None, None, 2),
+    ("get_wishlist_item", "GET", "/api/wishlist/{item_id}", None, None, 2),
+    ("update_wishlist_item", "PUT", "/api/wishlist/{item_id}", {"price": "79.00"}, None, 4),
+    # The source is on a loopback address, which is refused before connecting,
+    # so this answers 404 without the database
+    ("thumbnail", "GET", "{thumbnail_url}", None, None, 0),
+    ("delete_wishlist_item", "DELETE", "/api/wishlist/{deleted_item_id}", None, None, 3),
+    ("purchase_wishlist_item", "POST", "/api/wishlist/{item_id}/purchase", {}, None, 5),
+    (
+        "create_wishlist_item_to_buy", "POST", "/api/wishlist/",
+        {"item_name": "Mugs", "price": "24.00"}, "bought_item_id", 3,
+    ),
+    (
+        "purchase_wishlist_items", "POST", "/api/wishlist/purchase",
+        {"item_ids": ["{bought_item_id}"]}, None, 3,
+    ),
+    ("upsert_savings", "PUT", "/api/savings/", {"month": MONTH, "amount": "500.00"}, None, 2),
+    ("get_savings", "GET", "/api/savings/?month=" + MONTH, None, None, 2),
+    ("savings_range", "GET", f"/api/savings/range?from={MONTH}&to={NEXT_MONTH}", None, None, 2),
+    ("dashboard", "GET", "/api/dashboard/overview", None, None, 10),
+    ("delete_expense", "DELETE", "/api/expenses/{expense_id}", None, None, 3),
+    ("delete_income", "DELETE", "/api/incomes/{income_id}", None, None, 3),
+    ("delete_category", "DELETE", "/api/categories/{category_id}", None, None, 5),
+    ("health", "GET", "/health", None, None, 0),
+    ("password_reset", "POST", "/api/auth/password-reset", {"email": EMAIL}, "reset_token:token", 1),
+    # Last: revokes the access token used by every step above
+    (
+        "password_reset_confirm", "POST", "/api/auth/password-reset/confirm",
+        {"token": "{reset_token}", "new_password": "query-count-password-2"}, None, 4,
+    ),
+]
+
+# Steps expected to fail; every other step must succeed
+EXPECTED_STATUS = {"thumbnail": 404}
+
+
+def fill(value, ids: dict[str, str]):
+    """Substitute saved ids into a path or JSON body"""
+    if isinstance(value, str):
+        return value.format(**ids)
+    if isinstance(value, dict):
+        return {key: fill(item, ids) for key, item in value.items()}
+    if isinstance(value, list):
+        return [fill(item, ids) for item in value]
+    return value
+
+
+async def run(verbose: bool) -> list[str]:
+    """Run STEPS in order; returns the names of the steps that failed"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    failures = []
+    ids: dict[str, str] = {}
+    headers: dict[str, str] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(transport=transport, base_url="http://query-counts") as client,
+    ):
+        for name, method, path, body, save_as, expected in STEPS:
+            error = None
+            try:
+                with assert_query_count(expected) as statements:
+                    response = await client.request(
+                        method, fill(path, ids), json=fill(body, ids), headers=headers
+                    )
+            except AssertionError as exc:
+                error = str(exc)
+            expected_status = EXPECTED_STATUS.get(name)
+            if expected_status is not None:
+                if response.status_code != expected_status:
+                    error = f"HTTP {response.status_code}, expected {expected_status}"
+            elif response.status_code >= 400:
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+            elif save_as:
+                key, _, field = save_as.partition(":")
+                ids[key] = response.json()[field or "id"]
+            if name == "login":
+                headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+                ids["refresh_token"] = response.json()["refresh_token"]
+
+            print(f"{name:<32} {expected:>3} {len(statements):>3}  {'FAIL' if error else 'ok'}")
+            if error:
+                failures.append(name)
+                print("    " + error.replace("\n", "\n    "))
+            elif verbose:
+                for statement in statements:
+                    print(f"      {normalize_sql(statement)}")
+    await engine.dispose()
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--verbose", action="store_true", help="List every step's statements")
+    args = parser.parse_args()
+
+    print(f"{'step':<32} {'exp':>3} {'ran':>3}")
+    failures = asyncio.run(run(args.verbose))
+    if failures:
+        print(f"{len(failures)} step(s) failed: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
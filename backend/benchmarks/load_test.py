@@ -0,0 +1,334 @@
+"""Seed synthetic data and load-test the API in-process, reporting latency per route.
+
+Seeds DATABASE_URL (SQLite or PostgreSQL) with --users users, each with
+--expenses expenses, --incomes incomes and --wishlist wishlist items spread over
+the last six months, using bulk inserts. It then runs the real ASGI app, lifespan
+included, in this process and keeps --concurrency requests in flight for
+--duration seconds. Each request is a scenario picked at random by weight, for
+a random seeded user.
+
+Prints a JSON report with requests, errors, throughput and p50/p95/p99 latency
+per scenario, and writes it to --output if given. Pass a previous report as
+--compare to print the change per scenario next to it.
+
+The client runs on the same event loop as the app, so latencies include a little
+client overhead and throughput is bounded by one core. Compare runs made the
+same way rather than treating the numbers as absolute. On PostgreSQL, run the
+migrations first. On SQLite, tables are created if missing.
+
+Usage (from backend/):
+    python benchmarks/load_test.py --users 50 --expenses 500 --duration 30
+    python benchmarks/load_test.py --no-seed --mix dashboard=1 --output after.json \\
+        --compare before.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import insert, select
+from app.auth import create_access_token, get_password_hash, user_token_claims
+from app.config import settings
+from app.database import Base, engine
+from app.main import app
+from app.models import Expense, Income, User, Wishlist
+
+EMAIL_DOMAIN = "loadtest.example.com"
+PASSWORD = "load-test-password"
+INSERT_BATCH_SIZE = 2000
+CATEGORIES = ["Food", "Transport", "Shopping", "Bills", "Entertainment", "Health",
+              "Supermarket", "Travel", "Gym", "Other"]
+
+# name -> (method, path, JSON body factory or None)
+SCENARIOS = {
+    "dashboard": ("GET", "/api/dashboard/overview", None),
+    "list_expenses": ("GET", "/api/expenses/?limit=100", None),
+    "list_incomes": ("GET", "/api/incomes/", None),
+    "list_wishlist": ("GET", "/api/wishlist/", None),
+    "categories": ("GET", "/api/categories/", None),
+    "create_expense": (
+        "POST",
+        "/api/expenses/",
+        lambda: {
+            "amount": f"{random.randint(1, 20000) / 100:.2f}",
+            "category": random.choice(CATEGORIES),
+            "date": date.today().isoformat(),
+            "description": "Load test",
+        },
+    ),
+}
+DEFAULT_MIX = (
+    "dashboard=3,list_expenses=4,list_incomes=1,list_wishlist=2,categories=1,create_expense=1"
+)
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(
+                f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}"
+            )
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def random_day(rng: random.Random, today: date) -> date:
+    return today - timedelta(days=rng.randrange(183))
+
+
+async def insert_batches(conn, table, rows: list[dict]) -> None:
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        await conn.execute(insert(table), rows[start:start + INSERT_BATCH_SIZE])
+
+
+async def seed(users: int, expenses: int, incomes: int, wishlist: int) -> list[User]:
+    """Bulk insert users and their rows; returns the new users"""
+    rng = random.Random(0)
+    today = date.today()
+    run = uuid.uuid4().hex[:8]
+    # Hashing is deliberately slow; every seeded user shares one hash
+    hashed_password = get_password_hash(PASSWORD)
+
+    seeded = [
+        User(
+            id=uuid.uuid4(),
+            email=f"load-{run}-{i}@{EMAIL_DOMAIN}",
+            hashed_password=hashed_password,
+            is_active=True,
+            token_version=0,
+        )
+        for i in range(users)
+    ]
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        await insert_batches(conn, User.__table__, [
+            {
+                "id": user.id,
+                "email": user.email,
+                "hashed_password": hashed_password,
+                "is_active": True,
+                "token_version": 0,
+            }
+            for user in seeded
+        ])
+        await insert_batches(conn, Expense.__table__, [
+            {
+                "id": uuid.uuid4(),
+                "user_id": user.id,
+                "amount": Decimal(rng.randint(100, 25000)) / 100,
+                "category": rng.choice(CATEGORIES),
+                "date": random_day(rng, today),
+                "description": f"Synthetic expense {i}",
+            }
+            for user in seeded
+            for i in range(expenses)
+        ])
+        await insert_batches(conn, Income.__table__, [
+            {
+                "id": uuid.uuid4(),
+                "user_id": user.id,
+                "source": rng.choice(["Salary", "Freelance", "Dividends"]),
+                "amount": Decimal(rng.randint(50000, 500000)) / 100,
+                "date": random_day(rng, today),
+                "is_recurring": i % 2 == 0,
+                "frequency": "monthly" if i % 2 == 0 else None,
+            }
+            for user in seeded
+            for i in range(incomes)
+        ])
+        # No image URLs, so the image workers make no outbound requests
+        await insert_batches(conn, Wishlist.__table__, [
+            {
+                "id": uuid.uuid4(),
+                "user_id": user.id,
+                "item_name": f"Wishlist item {i}",
+                "price": Decimal(rng.randint(500, 200000)) / 100,
+                "url": f"https://shop.example.com/products/{i}",
+                "notes": "Synthetic item" if i % 3 == 0 else None,
+            }
+            for user in seeded
+            for i in range(wishlist)
+        ])
+    rows = users * (1 + expenses + incomes + wishlist)
+    print(
+        f"seeded {rows:,} rows in {time.perf_counter() - started:.1f}s",
+        file=sys.stderr,
+    )
+    return seeded
+
+
+async def existing_users() -> list[User]:
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            select(User.id, User.token_version, User.is_active).where(
+                User.email.like(f"%@{EMAIL_DOMAIN}")
+            )
+        )
+        return [
+            User(id=row.id, token_version=row.token_version, is_active=row.is_active)
+            for row in result
+        ]
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def summarize(latencies: list[float], errors: int, duration: float) -> dict:
+    if not latencies:
+        return {"requests": 0, "errors": errors}
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "throughput_rps": round(len(ordered) / duration, 1),
+        "mean_ms": round(statistics.fmean(ordered), 2),
+        "p50_ms": round(percentile(ordered, 0.50), 2),
+        "p95_ms": round(percentile(ordered, 0.95), 2),
+        "p99_ms": round(percentile(ordered, 0.99), 2),
+        "max_ms": round(ordered[-1], 2),
+    }
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    tokens: list[str],
+    mix: dict[str, float],
+    concurrency: int,
+    duration: float,
+) -> tuple[dict[str, list[float]], dict[str, int]]:
+    """Run scenarios until the deadline; returns latencies (ms) and errors per scenario"""
+    latencies: dict[str, list[float]] = {name: [] for name in mix}
+    errors: dict[str, int] = {name: 0 for name in mix}
+    names, weights = list(mix), list(mix.values())
+    deadline = time.monotonic() + duration
+
+    async def worker() -> None:
+        while time.monotonic() < deadline:
+            name = random.choices(names, weights)[0]
+            method, path, body = SCENARIOS[name]
+            headers = {"Authorization": f"Bearer {random.choice(tokens)}"}
+            start = time.perf_counter()
+            try:
+                response = await client.request(
+                    method, path, headers=headers, json=body() if body else None
+                )
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies[name].append((time.perf_counter() - start) * 1000)
+            else:
+                errors[name] += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def print_comparison(report: dict, baseline: dict) -> None:
+    print("change vs baseline (p50 / p95 / p99 ms, throughput)", file=sys.stderr)
+    for name, current in report["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous or not previous.get("requests") or not current.get("requests"):
+            continue
+        parts = [
+            f"{previous[key]:.1f} -> {current[key]:.1f}"
+            for key in ("p50_ms", "p95_ms", "p99_ms")
+        ]
+        change = current["throughput_rps"] / previous["throughput_rps"] - 1
+        print(
+            f"  {name:<15} {' / '.join(parts)}  {change:+.0%} req/s",
+            file=sys.stderr,
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--expenses", type=int, default=300, help="Per user")
+    parser.add_argument("--incomes", type=int, default=24, help="Per user")
+    parser.add_argument("--wishlist", type=int, default=20, help="Per user")
+    parser.add_argument("--no-seed", action="store_true", help="Reuse previously seeded users")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds not measured")
+    parser.add_argument(
+        "--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+        help=f"Scenario weights (default {DEFAULT_MIX})",
+    )
+    parser.add_argument("--output", default=None, help="Also write the JSON report here")
+    parser.add_argument("--compare", default=None, help="Previous JSON report")
+    args = parser.parse_args()
+
+    if not settings.DATABASE_URL:
+        sys.exit("Set DATABASE_URL")
+    if settings.DATABASE_URL.startswith("sqlite"):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    if args.no_seed:
+        users = await existing_users()
+        if not users:
+            sys.exit("No seeded users found; run without --no-seed first")
+    else:
+        users = await seed(args.users, args.expenses, args.incomes, args.wishlist)
+    # Valid for the whole run regardless of ACCESS_TOKEN_EXPIRE_MINUTES
+    tokens = [
+        create_access_token(user_token_claims(user), expires_delta=timedelta(hours=12))
+        for user in users
+    ]
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test") as client:
+            if args.warmup:
+                await drive(client, tokens, args.mix, args.concurrency, args.warmup)
+            started = time.perf_counter()
+            latencies, errors = await drive(
+                client, tokens, args.mix, args.concurrency, args.duration
+            )
+            elapsed = time.perf_counter() - started
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    report = {
+        "database": engine.dialect.name,
+        "users": len(users),
+        "concurrency": args.concurrency,
+        "duration_s": round(elapsed, 1),
+        "mix": args.mix,
+        "total": summarize(all_latencies, sum(errors.values()), elapsed),
+        "scenarios": {
+            name: {
+                "method": SCENARIOS[name][0],
+                "path": SCENARIOS[name][1],
+                **summarize(latencies[name], errors[name], elapsed),
+            }
+            for name in args.mix
+        },
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as report_file:
+            report_file.write(output + "\n")
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            print_comparison(report, json.load(baseline_file))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
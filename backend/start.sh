@@ -7,4 +7,4 @@ echo "Running database migrations..."
 uv run alembic upgrade head
 
 echo "Starting application..."
-uv run uvicorn app.main:app --host 0.0.0.0 --port $PORT
+uv run python -m app.serve --port $PORT
@@ -0,0 +1,89 @@
+"""Fixtures serving the app in-process over a throwaway SQLite database."""
+import os
+import tempfile
+
+# Settings are read when app.config is imported, so configure the app first
+_TEST_DIR = tempfile.mkdtemp(prefix="budget-tracker-tests-")
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///" + os.path.join(_TEST_DIR, "test.db")
+os.environ["DATABASE_READ_URL"] = ""
+os.environ["ENVIRONMENT"] = "test"
+os.environ["SECRET_KEY"] = "test-secret-key-of-reasonable-length"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["THUMBNAIL_DIR"] = os.path.join(_TEST_DIR, "thumbnails")
+
+from typing import Any, AsyncIterator, Optional
+import httpx
+import pytest
+from app.database import Base, engine
+from app.instrumentation import assert_query_count
+from app.main import app
+
+EMAIL = "tests@example.com"
+PASSWORD = "test-password"
+
+
+class Api:
+    """In-process client whose requests must run a pinned number of SQL statements"""
+
+    def __init__(self, client: httpx.AsyncClient) -> None:
+        self.client = client
+        self.headers: dict[str, str] = {}
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        queries: int,
+        json: Any = None,
+        status: int = 200,
+        headers: Optional[dict[str, str]] = None,
+    ) -> httpx.Response:
+        """Send a request, failing unless it answers `status` after `queries` statements"""
+        with assert_query_count(queries):
+            response = await self.client.request(
+                method, path, json=json, headers={**self.headers, **(headers or {})}
+            )
+            assert response.status_code == status, response.text
+        return response
+
+    async def call(self, method: str, path: str, json: Any = None) -> Any:
+        """Send a setup request without counting its statements; returns the JSON body"""
+        response = await self.client.request(method, path, json=json, headers=self.headers)
+        assert response.status_code < 400, response.text
+        return response.json()
+
+
+@pytest.fixture
+async def client() -> AsyncIterator[httpx.AsyncClient]:
+    """Client for the app running its lifespan over an empty database"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    transport = httpx.ASGITransport(app=app)
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(transport=transport, base_url="http://test") as client,
+    ):
+        yield client
+    # Pooled connections belong to this test's event loop
+    await engine.dispose()
+
+
+@pytest.fixture
+async def tokens(client: httpx.AsyncClient) -> dict[str, str]:
+    """Register and log in a user; returns the login response"""
+    credentials = {"email": EMAIL, "password": PASSWORD}
+    response = await client.post("/api/auth/register", json=credentials)
+    assert response.status_code < 400, response.text
+    response = await client.post("/api/auth/login", json=credentials)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.fixture
+def api(client: httpx.AsyncClient, tokens: dict[str, str]) -> Api:
+    """Api authenticated as the logged in user"""
+    api = Api(client)
+    api.headers["Authorization"] = f"Bearer {tokens['access_token']}"
+    return api
@@ -0,0 +1,48 @@
+"""Startup cost of `import app.main`, which every worker and CLI pays."""
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imported on first use by app.auth, app.http_client, app.utils and app.thumbnails
+DEFERRED_MODULES = ("httpx", "jose", "passlib", "PIL")
+
+# About twice the cold import time on a slow CI machine; catches a heavy
+# module creeping back into the startup path without flaking on noise
+IMPORT_BUDGET_MS = 2500
+RUNS = 3
+
+
+def import_app_main() -> tuple[float, list[str]]:
+    """Import app.main in a fresh interpreter; returns (ms, deferred modules loaded)"""
+    code = (
+        "import sys, app.main; "
+        f"print(' '.join(m for m in sys.modules if m.split('.')[0] in {DEFERRED_MODULES!r}))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR,
+        env=os.environ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = next(
+        int(line.split("|")[1])
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and line.split("|")[2].strip() == "app.main"
+    )
+    return total_us / 1000, result.stdout.split()
+
+
+def test_deferred_modules_not_imported():
+    _, eager = import_app_main()
+    eager_roots = sorted({name.split(".")[0] for name in eager})
+    assert not eager_roots, f"imported at startup: {', '.join(eager_roots)}"
+
+
+def test_import_time_within_budget():
+    # The fastest run is the least disturbed by whatever else the machine is doing
+    fastest = min(import_app_main()[0] for _ in range(RUNS))
+    assert fastest < IMPORT_BUDGET_MS, f"import app.main took {fastest:.0f} ms"
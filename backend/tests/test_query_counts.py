@@ -0,0 +1,309 @@
+"""Number of SQL statements each endpoint runs.
+
+Relationships are lazy="raise", so an accidental lazy load fails outright;
+these catch the other kind of regression: a query added to a route, or a loop
+that queries per row. When a change alters a count on purpose, update the test
+(and STEPS in benchmarks/check_query_counts.py) in the same commit.
+"""
+import pytest
+from app.thumbnails import thumbnail_path
+from conftest import EMAIL, PASSWORD, Api
+
+MONTH = "2026-10-01"
+NEXT_MONTH = "2026-11-01"
+
+
+@pytest.fixture
+async def category(api: Api) -> dict:
+    return await api.call(
+        "POST", "/api/categories/", {"name": "Coffee", "icon": "cup", "color": "#6f4e37"}
+    )
+
+
+@pytest.fixture
+async def budget(api: Api, category: dict) -> dict:
+    return await api.call(
+        "PUT",
+        "/api/budgets/",
+        {"category_id": category["id"], "month": MONTH, "amount": "150.00"},
+    )
+
+
+@pytest.fixture
+async def expense(api: Api, category: dict) -> dict:
+    return await api.call(
+        "POST",
+        "/api/expenses/",
+        {"amount": "4.20", "category": "Coffee", "date": "2026-10-19", "description": "Flat white"},
+    )
+
+
+@pytest.fixture
+async def income(api: Api) -> dict:
+    return await api.call(
+        "POST", "/api/incomes/", {"source": "Salary", "amount": "3000.00", "date": "2026-10-01"}
+    )
+
+
+@pytest.fixture
+async def item(api: Api) -> dict:
+    return await api.call("POST", "/api/wishlist/", {"item_name": "Grinder", "price": "89.00"})
+
+
+# Authentication
+
+
+async def test_register(client):
+    await Api(client).request(
+        "POST",
+        "/api/auth/register",
+        json={"email": EMAIL, "password": PASSWORD},
+        status=201,
+        queries=3,
+    )
+
+
+async def test_login(client, tokens):
+    await Api(client).request(
+        "POST", "/api/auth/login", json={"email": EMAIL, "password": PASSWORD}, queries=1
+    )
+
+
+async def test_refresh(client, tokens):
+    await Api(client).request(
+        "POST", "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}, queries=1
+    )
+
+
+async def test_password_reset(api):
+    await api.request("POST", "/api/auth/password-reset", json={"email": EMAIL}, queries=1)
+
+
+async def test_password_reset_confirm(api):
+    reset = await api.call("POST", "/api/auth/password-reset", {"email": EMAIL})
+    await api.request(
+        "POST",
+        "/api/auth/password-reset/confirm",
+        json={"token": reset["token"], "new_password": "test-password-2"},
+        queries=4,
+    )
+
+
+# Categories
+
+
+async def test_list_categories(api):
+    await api.request("GET", "/api/categories/", queries=2)
+
+
+async def test_default_categories(api):
+    await api.request("GET", "/api/categories/defaults", queries=0)
+
+
+async def test_create_category(api):
+    await api.request(
+        "POST",
+        "/api/categories/",
+        json={"name": "Coffee", "icon": "cup", "color": "#6f4e37"},
+        status=201,
+        queries=4,
+    )
+
+
+async def test_update_category(api, category):
+    await api.request(
+        "PUT", f"/api/categories/{category['id']}", json={"color": "#000000"}, queries=4
+    )
+
+
+async def test_delete_category(api, category, budget, expense):
+    await api.request("DELETE", f"/api/categories/{category['id']}", queries=5)
+
+
+# Budgets
+
+
+async def test_upsert_budget(api, category):
+    await api.request(
+        "PUT",
+        "/api/budgets/",
+        json={"category_id": category["id"], "month": MONTH, "amount": "150.00"},
+        queries=3,
+    )
+
+
+async def test_bulk_upsert_budgets(api, category):
+    await api.request(
+        "PUT",
+        "/api/budgets/bulk",
+        json={"month": MONTH, "budgets": [{"category_id": category["id"], "amount": "175.00"}]},
+        queries=3,
+    )
+
+
+async def test_copy_budgets(api, budget):
+    await api.request("POST", f"/api/budgets/copy?from={MONTH}&to={NEXT_MONTH}", queries=2)
+
+
+async def test_list_budgets(api, budget):
+    await api.request("GET", f"/api/budgets/?month={MONTH}", queries=2)
+
+
+async def test_budget_progress(api, budget, expense):
+    await api.request("GET", f"/api/budgets/progress?month={MONTH}", queries=2)
+
+
+# Expenses
+
+
+async def test_create_expense(api, category):
+    await api.request(
+        "POST",
+        "/api/expenses/",
+        json={"amount": "4.20", "category": "Coffee", "date": "2026-10-19"},
+        status=201,
+        queries=3,
+    )
+
+
+async def test_list_expenses(api, expense):
+    await api.request("GET", "/api/expenses/", queries=2)
+
+
+async def test_expense_stats(api, expense):
+    await api.request("GET", "/api/expenses/stats", queries=2)
+
+
+async def test_get_expense(api, expense):
+    await api.request("GET", f"/api/expenses/{expense['id']}", queries=2)
+
+
+async def test_update_expense(api, expense):
+    await api.request(
+        "PUT",
+        f"/api/expenses/{expense['id']}",
+        json={"amount": "4.50", "category": "Coffee", "date": "2026-10-19"},
+        queries=4,
+    )
+
+
+async def test_delete_expense(api, expense):
+    await api.request("DELETE", f"/api/expenses/{expense['id']}", queries=3)
+
+
+# Incomes
+
+
+async def test_create_income(api):
+    await api.request(
+        "POST",
+        "/api/incomes/",
+        json={"source": "Salary", "amount": "3000.00", "date": "2026-10-01"},
+        status=201,
+        queries=3,
+    )
+
+
+async def test_list_incomes(api, income):
+    await api.request("GET", "/api/incomes/", queries=2)
+
+
+async def test_get_income(api, income):
+    await api.request("GET", f"/api/incomes/{income['id']}", queries=2)
+
+
+async def test_update_income(api, income):
+    await api.request("PUT", f"/api/incomes/{income['id']}", json={"amount": "3100.00"}, queries=4)
+
+
+async def test_income_total(api, income):
+    await api.request("GET", "/api/incomes/total", queries=2)
+
+
+async def test_delete_income(api, income):
+    await api.request("DELETE", f"/api/incomes/{income['id']}", queries=3)
+
+
+# Wishlist
+
+
+async def test_create_wishlist_item(api):
+    await api.request(
+        "POST",
+        "/api/wishlist/",
+        json={"item_name": "Grinder", "price": "89.00"},
+        status=201,
+        queries=3,
+    )
+
+
+async def test_create_wishlist_item_with_image(api):
+    await api.request(
+        "POST",
+        "/api/wishlist/",
+        json={"item_name": "Kettle", "price": "45.00", "image_url": "https://example.com/kettle.jpg"},
+        status=201,
+        queries=3,
+    )
+
+
+async def test_list_wishlist(api, item):
+    await api.request("GET", "/api/wishlist/", queries=2)
+
+
+async def test_wishlist_total(api, item):
+    await api.request("GET", "/api/wishlist/total", queries=2)
+
+
+async def test_get_wishlist_item(api, item):
+    await api.request("GET", f"/api/wishlist/{item['id']}", queries=2)
+
+
+async def test_update_wishlist_item(api, item):
+    await api.request("PUT", f"/api/wishlist/{item['id']}", json={"price": "79.00"}, queries=4)
+
+
+async def test_delete_wishlist_item(api, item):
+    await api.request("DELETE", f"/api/wishlist/{item['id']}", queries=3)
+
+
+async def test_purchase_wishlist_item(api, item):
+    await api.request("POST", f"/api/wishlist/{item['id']}/purchase", json={}, queries=5)
+
+
+async def test_purchase_wishlist_items(api, item):
+    await api.request(
+        "POST", "/api/wishlist/purchase", json={"item_ids": [item["id"]]}, queries=3
+    )
+
+
+async def test_thumbnail(client):
+    # The source is on a loopback address, so it is refused before connecting
+    await Api(client).request(
+        "GET", thumbnail_path("http://127.0.0.1:9/kettle.jpg"), status=404, queries=0
+    )
+
+
+# Savings and dashboard
+
+
+async def test_upsert_savings(api):
+    await api.request("PUT", "/api/savings/", json={"month": MONTH, "amount": "500.00"}, queries=2)
+
+
+async def test_get_savings(api):
+    await api.call("PUT", "/api/savings/", {"month": MONTH, "amount": "500.00"})
+    await api.request("GET", f"/api/savings/?month={MONTH}", queries=2)
+
+
+async def test_savings_range(api):
+    await api.call("PUT", "/api/savings/", {"month": MONTH, "amount": "500.00"})
+    await api.request("GET", f"/api/savings/range?from={MONTH}&to={NEXT_MONTH}", queries=2)
+
+
+async def test_dashboard(api, budget, expense, income, item):
+    await api.request("GET", "/api/dashboard/overview", queries=10)
+
+
+async def test_health(client):
+    await Api(client).request("GET", "/health", queries=0)
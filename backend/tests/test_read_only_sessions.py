@@ -0,0 +1,65 @@
+"""Read routes use AUTOCOMMIT sessions, which refuse to write."""
+from collections.abc import Iterator
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event, update
+from app.database import ReadOnlySessionError, ReadSessionLocal, engine
+from app.models import Category, Expense
+
+
+@contextmanager
+def transactions() -> Iterator[list[str]]:
+    """Record the BEGIN, COMMIT and ROLLBACK round trips sent to the database.
+
+    SQLAlchemy fires these events on AUTOCOMMIT connections too, but sends
+    nothing for them, so those are left out.
+    """
+    sent: list[str] = []
+
+    def recorder(name: str):
+        def record(conn, *args) -> None:
+            if conn.get_execution_options().get("isolation_level") != "AUTOCOMMIT":
+                sent.append(name)
+
+        return record
+
+    listeners = [(name, recorder(name.upper())) for name in ("begin", "commit", "rollback")]
+    for name, listener in listeners:
+        event.listen(engine.sync_engine, name, listener)
+    try:
+        yield sent
+    finally:
+        for name, listener in listeners:
+            event.remove(engine.sync_engine, name, listener)
+
+
+async def test_write_sends_transaction(api):
+    # Guards the check below against recording nothing at all
+    with transactions() as sent:
+        await api.call(
+            "POST", "/api/incomes/", {"source": "Salary", "amount": "3000.00", "date": "2026-10-01"}
+        )
+    assert "BEGIN" in sent and "COMMIT" in sent
+
+
+@pytest.mark.parametrize("path", ["/api/expenses/", "/api/dashboard/overview"])
+async def test_read_route_sends_no_transaction(api, path):
+    await api.call(
+        "POST", "/api/expenses/", {"amount": "4.20", "category": "Food", "date": "2026-10-19"}
+    )
+    with transactions() as sent:
+        await api.call("GET", path)
+    assert sent == []
+
+
+async def test_flush_raises(client):
+    async with ReadSessionLocal() as session:
+        session.add(Category(name="Coffee", icon="cup", color="#6f4e37"))
+        with pytest.raises(ReadOnlySessionError):
+            await session.flush()
+
+
+async def test_bulk_write_raises(client):
+    async with ReadSessionLocal() as session:
+        with pytest.raises(ReadOnlySessionError):
+            await session.execute(update(Expense).values(description="changed"))
@@ -16,6 +16,11 @@ api.interceptors.request.use(
     if (token) {
       config.headers.Authorization = `Bearer ${token}`;
     }
+    // Keeps our reads on the primary database right after we write
+    const lastWrite = localStorage.getItem('last_write');
+    if (lastWrite) {
+      config.headers['X-Last-Write'] = lastWrite;
+    }
     return config;
   },
   (error) => {
@@ -25,7 +30,13 @@ api.interceptors.request.use(
 
 // Handle token refresh on 401
 api.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    const lastWrite = response.headers['x-last-write'];
+    if (lastWrite) {
+      localStorage.setItem('last_write', lastWrite);
+    }
+    return response;
+  },
   async (error) => {
     const originalRequest = error.config;
 
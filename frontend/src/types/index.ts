@@ -78,6 +78,8 @@ export interface WishlistItem {
   price: number;
   url?: string;
   image_url?: string;
+  image_status?: 'pending' | 'ready' | 'failed' | null;
+  thumbnail_url?: string | null;
   notes?: string;
   created_at: string;
   updated_at?: string;